@@ -0,0 +1,519 @@
+"""
+Benchmark Module
+Times the hot paths of the app against synthetic data on the offline
+fake_sheets backend – no Google credentials needed
+
+Cases:
+    fetch       cold get_candidates/get_vacancies/get_interviews/get_companies
+    match       build_vacancy_index + run_matching
+    interviews  get_schedulable_interviews + get_updatable_interviews
+    reports     admin_reports() aggregations (Streamlit bare mode)
+    export      export_to_interview_sheet() of EXPORT_BATCH matches
+
+Usage:
+    python benchmark.py                              # 1k and 10k rows
+    python benchmark.py --scales 1000 10000 100000 --cases match reports
+    python benchmark.py --compare .cache/benchmarks/previous.json
+    python benchmark.py --write-fake-data fake.json --scales 1000
+        (then: SHEETS_FAKE_DATA=fake.json streamlit run app.py)
+
+Results are written as JSON (one entry per case and scale) so runs can
+be compared; --compare prints the change per case and exits with 1 if a
+case got slower than --max-regression percent.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Benchmarks always start from an empty cache (no SQLite mirror)
+os.environ["SHEETS_MIRROR_PATH"] = ""
+
+import numpy as np
+import pandas as pd
+
+import sheets_connector
+from fake_sheets import FakeClient
+
+DEFAULT_SCALES = [1000, 10000]
+CASES = ["fetch", "match", "interviews", "reports", "export"]
+RESULTS_DIR = os.path.join(".cache", "benchmarks")
+
+# Vacancies per candidate row and matcher sample size (full cross product
+# at 100k x 5k would take hours on the row-by-row paths being compared)
+VACANCY_RATIO = 20
+MATCH_LIMIT = 10000
+EXPORT_BATCH = 100
+
+
+# ====================================================
+# SYNTHETIC DATA
+# ====================================================
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Sai", "Reyansh", "Ayaan",
+    "Krishna", "Ishaan", "Ananya", "Diya", "Aadhya", "Saanvi", "Pari",
+    "Anika", "Navya", "Myra", "Sara", "Riya", "Rahul", "Priya", "Neha",
+    "Amit", "Sunita", "Pooja", "Rohit", "Kavita", "Manoj", "Deepak",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Patel", "Yadav", "Jain",
+    "Mishra", "Agarwal", "Chauhan", "Reddy", "Nair", "Iyer", "Das", "Bose",
+]
+CITIES = [
+    ("Jaipur", "Jaipur", "Rajasthan"), ("Delhi", "New Delhi", "Delhi"),
+    ("Noida", "Gautam Buddh Nagar", "Uttar Pradesh"),
+    ("Gurugram", "Gurugram", "Haryana"), ("Mumbai", "Mumbai", "Maharashtra"),
+    ("Pune", "Pune", "Maharashtra"), ("Bengaluru", "Bengaluru", "Karnataka"),
+    ("Hyderabad", "Hyderabad", "Telangana"), ("Lucknow", "Lucknow", "Uttar Pradesh"),
+    ("Indore", "Indore", "Madhya Pradesh"), ("Ahmedabad", "Ahmedabad", "Gujarat"),
+    ("Kolkata", "Kolkata", "West Bengal"), ("Chennai", "Chennai", "Tamil Nadu"),
+]
+JOB_TITLES = [
+    "Sales Executive", "Customer Support Executive", "Telecaller",
+    "Data Entry Operator", "Accountant", "Office Assistant",
+    "Field Sales Executive", "Back Office Executive", "HR Executive",
+    "Delivery Boy", "Store Manager", "Receptionist", "Computer Operator",
+    "Marketing Executive", "Software Developer", "Web Designer",
+    "Graphic Designer", "Warehouse Supervisor", "Security Guard",
+    "Electrician", "Driver", "Cashier", "Team Leader", "Branch Manager",
+]
+DEGREES = ["B.Com", "B.A", "B.Sc", "BBA", "BCA", "B.Tech", "MBA", "M.Com", "12th", "Diploma"]
+SKILLS = [
+    "MS Excel", "Tally", "Communication", "Sales", "Negotiation", "Typing",
+    "Python", "Java", "SQL", "Photoshop", "CorelDraw", "Customer Handling",
+    "Cold Calling", "Inventory", "Driving", "GST", "Leadership",
+]
+INDUSTRIES = ["Retail", "IT", "BPO", "Manufacturing", "Logistics", "Banking", "FMCG"]
+SALARIES = [str(s) for s in range(10000, 60001, 2500)]
+
+INTERVIEW_HEADERS = [
+    "Record ID", "Date Created", "Candidate ID", "Full Name", "Company Name",
+    "CID", "Job Title", "Match Score", "Interview Status", "Interview Date",
+    "Interview Time", "Interview Round", "Result Status", "Salary Offered",
+    "Joining Date", "Remarks", "Last Updated", "Updated By",
+]
+VACANCY_HEADERS = [
+    "Company Name", "CID", "Job Title", "DGN ID", "Salary", "Job Description",
+    "Education Required", "Skills Required", "Experience Required",
+    "Vacancy Count", "Vacancy Filled", "Contact Person", "Contact Number",
+    "Additional Notes", "Date Added", "Job Location/City", "City",
+    "Gender Preference", "Job Type", "Job Timing", "Shift Timings",
+    "Notice Period Acceptable", "Work Mode", "Age Range Min", "Age Range Max",
+    "Preferred Candidate Location", "status", "Urgency Level",
+]
+COMPANY_HEADERS = [
+    "Company Name", "CID", "Industry", "Company Description", "Contact Number",
+    "Address of Company", "City", "State", "PIN Code", "Email", "Website",
+    "Date Added",
+]
+
+
+def _when(rnd, now, days=90, fmt="%Y-%m-%d %H:%M:%S"):
+    """Random timestamp in the last `days` days (today included)."""
+    return (now - timedelta(seconds=rnd.randint(0, days * 86400))).strftime(fmt)
+
+
+def _phone(rnd):
+    return str(rnd.randint(6000000000, 9999999999))
+
+
+def generate_companies(n, rnd, now):
+    rows = [COMPANY_HEADERS]
+    for i in range(1, n + 1):
+        city, _, state = rnd.choice(CITIES)
+        name = f"{rnd.choice(LAST_NAMES)} {rnd.choice(INDUSTRIES)} Pvt Ltd {i}"
+        rows.append([
+            name, f"CID{i:04d}", rnd.choice(INDUSTRIES), "Synthetic company",
+            _phone(rnd), f"{rnd.randint(1, 999)} Main Road", city, state,
+            str(rnd.randint(110001, 799999)), f"hr{i}@example.com",
+            f"www.company{i}.example", _when(rnd, now, 365),
+        ])
+    return rows
+
+
+def generate_vacancies(n, companies, rnd, now):
+    rows = [VACANCY_HEADERS]
+    for i in range(n):
+        company = companies[1 + i % (len(companies) - 1)]
+        city = rnd.choice(CITIES)[0]
+        count = rnd.randint(1, 10)
+        closed = rnd.random() < 0.2
+        filled = count if closed else rnd.randint(0, count - 1)
+        rows.append([
+            company[0], company[1], rnd.choice(JOB_TITLES), f"DGN{i % 500:03d}",
+            rnd.choice(SALARIES), "Synthetic vacancy", rnd.choice(DEGREES),
+            ", ".join(rnd.sample(SKILLS, 3)), str(rnd.randint(0, 8)),
+            str(count), str(filled), rnd.choice(FIRST_NAMES), _phone(rnd), "",
+            _when(rnd, now, 60), city, city, rnd.choice(["Any", "Male", "Female"]),
+            rnd.choice(["Full Time", "Part Time"]), "10 AM - 6 PM", "Day",
+            rnd.choice(["Yes", "No"]), rnd.choice(["Office", "Remote", "Hybrid"]),
+            "18", "40", city, "Closed" if closed else "Open",
+            rnd.choice(["Low", "Medium", "High"]),
+        ])
+    return rows
+
+
+def generate_candidates(n, columns, rnd, now):
+    """Candidates sheet rows with every REQUIRED_COLUMNS header."""
+    rows = [list(columns)]
+    for i in range(1, n + 1):
+        city, district, state = rnd.choice(CITIES)
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        prefs = rnd.sample(JOB_TITLES, 3)
+        fresher = rnd.random() < 0.4
+        applied = now - timedelta(seconds=rnd.randint(0, 90 * 86400))
+        values = {
+            "Candidate ID": f"CND{applied.strftime('%Y%m%d')}{i:06d}",
+            "Date Applied": applied.strftime("%Y-%m-%d %H:%M:%S"),
+            "Full Name": f"{first} {last}",
+            "Father Name": f"{rnd.choice(FIRST_NAMES)} {last}",
+            "DOB": f"{rnd.randint(1975, 2005)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            "Gender": rnd.choice(["Male", "Female"]),
+            "Marital Status": rnd.choice(["Single", "Married"]),
+            "Category": rnd.choice(["General", "OBC", "SC", "ST"]),
+            "Aadhaar": str(rnd.randint(10 ** 11, 10 ** 12 - 1)),
+            "PAN": f"ABCDE{rnd.randint(1000, 9999)}F",
+            "Mobile": _phone(rnd), "Alt Mobile": _phone(rnd),
+            "Email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "WhatsApp": _phone(rnd),
+            "Current Address": f"{rnd.randint(1, 999)} Sector {rnd.randint(1, 99)}",
+            "Current City": city, "Current District": district,
+            "Current State": state, "Current PIN": str(rnd.randint(110001, 799999)),
+            "Permanent Address": f"{rnd.randint(1, 999)} Village Road",
+            "Permanent City": city, "Permanent District": district,
+            "Permanent State": state, "Permanent PIN": str(rnd.randint(110001, 799999)),
+            "Job Pref 1": prefs[0], "Job Pref 2": prefs[1], "Job Pref 3": prefs[2],
+            "Preferred Location": rnd.choice(CITIES)[0],
+            "Expected Salary": rnd.choice(SALARIES),
+            "Notice Period": rnd.choice(["Immediate", "15 Days", "30 Days"]),
+            "Willing to Relocate": rnd.choice(["Yes", "No"]),
+            "10th Board": "CBSE", "10th Year": str(rnd.randint(1995, 2020)),
+            "10th Percentage": str(rnd.randint(45, 95)),
+            "12th Board": "CBSE", "12th Stream": rnd.choice(["Science", "Commerce", "Arts"]),
+            "12th Year": str(rnd.randint(1997, 2022)),
+            "12th Percentage": str(rnd.randint(45, 95)),
+            "Graduation Degree": rnd.choice(DEGREES),
+            "Graduation University": "State University",
+            "Graduation Specialization": rnd.choice(["General", "Finance", "Computer"]),
+            "Graduation Year": str(rnd.randint(2000, 2024)),
+            "Graduation Percentage": str(rnd.randint(45, 90)),
+            "Computer Skills": ", ".join(rnd.sample(SKILLS, 2)),
+            "Technical Skills": ", ".join(rnd.sample(SKILLS, 3)),
+            "Other Skills": rnd.choice(SKILLS),
+            "Hindi Level": rnd.choice(["Good", "Fluent"]),
+            "English Level": rnd.choice(["Basic", "Good", "Fluent"]),
+            "Is Fresher": "Yes" if fresher else "No",
+            "Experience Years": "0" if fresher else str(rnd.randint(1, 12)),
+            "Experience Months": str(rnd.randint(0, 11)),
+            "Current CTC": "" if fresher else rnd.choice(SALARIES),
+            "Disability": "No", "Disability Details": "",
+            "Own Vehicle": rnd.choice(["Yes", "No"]),
+            "Driving License": rnd.choice(["Yes", "No"]),
+            "Reference 1 Name": rnd.choice(FIRST_NAMES),
+            "Reference 1 Designation": "Manager",
+            "Reference 1 Organization": "Previous Employer",
+            "Reference 1 Contact": _phone(rnd),
+            "Reference 2 Name": "", "Reference 2 Contact": "",
+            "Status": rnd.choice(["Pending", "Pending", "Selected", "Hold", "Rejected"]),
+        }
+        rows.append([values.get(col, "") for col in columns])
+    return rows
+
+
+def generate_interviews(n, candidates, vacancies, rnd, now):
+    """Interview_Records rows with a realistic status mix (and duplicates)."""
+    rows = [INTERVIEW_HEADERS]
+    cand_rows = candidates[1:]
+    vac_rows = vacancies[1:]
+    statuses = (
+        ["Matched"] * 50 + ["Interview Scheduled"] * 20
+        + ["Interview Completed"] * 20 + ["Cancelled due to Selection"] * 10
+    )
+    for i in range(1, n + 1):
+        cand = rnd.choice(cand_rows)
+        vac = rnd.choice(vac_rows)
+        status = rnd.choice(statuses)
+        result = "Pending"
+        if status == "Interview Completed":
+            result = rnd.choice(["Selected", "Rejected", "Hold", "Pending"])
+        elif status == "Cancelled due to Selection":
+            result = status
+        scheduled = status != "Matched"
+        rows.append([
+            f"IR{i:03d}", _when(rnd, now, 90, "%Y-%m-%d"), cand[0], cand[2],
+            vac[0], vac[1], vac[2], f"{rnd.randint(50, 100)}%", status,
+            _when(rnd, now, 30, "%Y-%m-%d") if scheduled else "",
+            f"{rnd.randint(10, 17)}:00" if scheduled else "",
+            str(rnd.randint(1, 3)) if scheduled else "", result,
+            rnd.choice(SALARIES) if result == "Selected" else "", "", "",
+            _when(rnd, now, 30), "System",
+        ])
+    return rows
+
+
+def generate_dataset(scale, seed=42):
+    """
+    {title: rows} for every tab the app reads, `scale` candidates and
+    interview records, scale / VACANCY_RATIO vacancies.
+    """
+    from app import REQUIRED_COLUMNS
+
+    rnd = random.Random(seed)
+    now = datetime.now()
+    n_vacancies = max(10, scale // VACANCY_RATIO)
+    companies = generate_companies(max(5, n_vacancies // 4), rnd, now)
+    vacancies = generate_vacancies(n_vacancies, companies, rnd, now)
+    candidates = generate_candidates(scale, REQUIRED_COLUMNS, rnd, now)
+    interviews = generate_interviews(scale, candidates, vacancies, rnd, now)
+    return {
+        "Candidates": candidates,
+        "Sheet4": vacancies,
+        "CID": companies,
+        "Interview_Records": interviews,
+        "Sheet2": [["Designation", "DGN ID"]] + [
+            [title, f"DGN{i:03d}"] for i, title in enumerate(JOB_TITLES)
+        ],
+        "Users": [
+            ["Username", "Password", "Role", "Full Name", "Email", "Status", "Created Date"],
+            ["admin", "", "ADMIN", "Admin", "admin@example.com", "Active", "2024-01-01"],
+        ],
+        "Login_Logs": [["Timestamp", "Username", "Status", "IP Address"]],
+    }
+
+
+# ====================================================
+# HARNESS
+# ====================================================
+def _time_case(func, repeat, client, setup=None):
+    """Run func `repeat` times; returns (timings, API calls per run)."""
+    timings = []
+    calls_before = client.calls.total()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings, (client.calls.total() - calls_before) / repeat
+
+
+def _cold_caches():
+    import streamlit as st
+
+    sheets_connector.invalidate_sheet()
+    st.cache_data.clear()
+
+
+def run_scale(scale, cases, repeat, seed=42, latency=0.0, match_limit=MATCH_LIMIT):
+    """Benchmark every requested case at one data size; returns result dicts."""
+    import streamlit.logger
+    from streamlit import config
+
+    # Streamlit warns on every UI call outside `streamlit run` (bare mode);
+    # parse its config first so it doesn't reset the level afterwards
+    config.get_config_options()
+    streamlit.logger.set_log_level("error")
+    import app
+    from job_matcher_module import (
+        build_vacancy_index, export_to_interview_sheet, run_matching,
+    )
+
+    client = FakeClient({sheets_connector.SHEET_ID: generate_dataset(scale, seed)},
+                        latency=latency)
+    sheets_connector.set_backend(client)
+    _cold_caches()
+
+    frames = {
+        "candidates": app.get_candidates(),
+        "vacancies": app.get_vacancies(),
+        "interviews": app.get_interviews(),
+        "companies": app.get_companies(),
+    }
+    sizes = {name: len(df) for name, df in frames.items()}
+    match_candidates = frames["candidates"].head(match_limit)
+
+    def fetch():
+        app.get_candidates()
+        app.get_vacancies()
+        app.get_interviews()
+        app.get_companies()
+
+    def match():
+        index = build_vacancy_index(frames["vacancies"], with_blocks=True)
+        run_matching(match_candidates, frames["vacancies"], vacancy_index=index)
+
+    def interviews():
+        app.get_schedulable_interviews(frames["interviews"], frames["vacancies"])
+        app.get_updatable_interviews(frames["interviews"], frames["vacancies"])
+
+    def reports():
+        app.admin_reports()
+
+    cand = frames["candidates"]
+    vac = frames["vacancies"]
+    export_runs = itertools.count()
+    export_matches = []
+
+    def new_export_batch():
+        # Fresh CIDs every run (untimed) – repeating the same batch would
+        # only measure the duplicate check, not the append
+        run = next(export_runs)
+        export_matches[:] = [
+            {
+                "Candidate ID": cand["Candidate ID"].iloc[i % len(cand)],
+                "Full Name": cand["Full Name"].iloc[i % len(cand)],
+                "Company Name": vac["Company Name"].iloc[i % len(vac)],
+                "CID": f"BENCH{run:03d}{i:04d}",
+                "Job Title": vac["Job Title"].iloc[i % len(vac)],
+                "Match Score": 75,
+            }
+            for i in range(EXPORT_BATCH)
+        ]
+
+    def export():
+        export_to_interview_sheet(client, sheets_connector.SHEET_ID, export_matches)
+
+    funcs = {
+        "fetch": (fetch, _cold_caches),
+        "match": (match, None),
+        "interviews": (interviews, None),
+        "reports": (reports, None),
+        "export": (export, new_export_batch),
+    }
+    extra = {
+        "match": {"match_candidates": len(match_candidates)},
+        "export": {"export_batch": EXPORT_BATCH},
+    }
+
+    results = []
+    for case in cases:
+        func, setup = funcs[case]
+        timings, calls = _time_case(func, repeat, client, setup)
+        result = {
+            "case": case,
+            "scale": scale,
+            "rows": dict(sizes, **extra.get(case, {})),
+            "repeat": repeat,
+            "seconds": {
+                "min": min(timings),
+                "median": statistics.median(timings),
+                "mean": statistics.fmean(timings),
+            },
+            "api_calls": calls,
+        }
+        results.append(result)
+        print(
+            f"{case:<11} {scale:>7} rows  "
+            f"median {result['seconds']['median']:9.4f}s  "
+            f"min {result['seconds']['min']:9.4f}s  api calls {calls:g}",
+            flush=True,
+        )
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(results, baseline_path, max_regression):
+    """Print per-case change vs a previous results file; True if no regression."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (r["case"], r["scale"]): r for r in json.load(f)["results"]
+        }
+    ok = True
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        old = baseline.get((result["case"], result["scale"]))
+        if old is None:
+            continue
+        before = old["seconds"]["median"]
+        after = result["seconds"]["median"]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > max_regression:
+            flag = "  <-- REGRESSION"
+            ok = False
+        print(
+            f"{result['case']:<11} {result['scale']:>7} rows  "
+            f"{before:9.4f}s -> {after:9.4f}s  ({change:+.1f}%){flag}"
+        )
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated seconds per Sheets API call")
+    parser.add_argument("--match-limit", type=int, default=MATCH_LIMIT,
+                        help="max candidates in the match case")
+    parser.add_argument("--output", help="results JSON (default: .cache/benchmarks/<time>.json)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="percent slowdown that fails --compare")
+    parser.add_argument("--write-fake-data",
+                        help="only write a fake_sheets JSON for the first scale and exit")
+    args = parser.parse_args(argv)
+
+    if args.write_fake_data:
+        client = FakeClient(
+            {sheets_connector.SHEET_ID: generate_dataset(args.scales[0], args.seed)},
+            path=args.write_fake_data,
+        )
+        client.save()
+        print(f"Wrote {args.write_fake_data}")
+        return 0
+
+    results = []
+    for scale in args.scales:
+        results.extend(run_scale(
+            scale, args.cases, args.repeat, args.seed, args.latency, args.match_limit
+        ))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    folder = os.path.dirname(output)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "args": vars(args),
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
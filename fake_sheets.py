@@ -0,0 +1,398 @@
+"""
+Fake Sheets Module
+Offline stand-in for the gspread client – no credentials, no network
+Implements the gspread subset this app uses, with optional latency and
+quota (429) error injection for load tests and benchmarks
+
+Usage:
+    client = FakeClient({SHEET_ID: {"Candidates": [[...header...], [...]]}})
+    sheets_connector.set_backend(client)
+or run the whole app offline:
+    SHEETS_FAKE_DATA=fake_sheets.json streamlit run app.py
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+
+import requests
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, fill_gaps, rowcol_to_a1
+from gspread.worksheet import Worksheet
+
+
+def _cell_text(value):
+    """Cell as the API returns it (formatted string)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def _trimmed(rows):
+    """Drop trailing empty cells / rows like the Sheets API does."""
+    out = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def _split_range(name):
+    """"'My Tab'!A1:B2" → ("My Tab", "A1:B2"); bare "Tab" → ("Tab", None)."""
+    if "!" in name:
+        title, cells = name.rsplit("!", 1)
+    else:
+        title, cells = name, None
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+_ERROR_STATUS = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+}
+
+
+def _error_response(status, message):
+    """requests.Response shaped like a Sheets API error (for APIError)."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({"error": {
+        "code": status,
+        "message": message,
+        "status": _ERROR_STATUS.get(status, "UNKNOWN"),
+    }}).encode("utf-8")
+    return response
+
+
+# ====================================================
+# CLIENT
+# ====================================================
+class FakeClient:
+    """
+    Stand-in for gspread.Client.
+
+    data:            {sheet_id: {title: rows}} (rows = list of lists)
+    path:            optional JSON file – loaded if it exists, saved after writes
+    latency:         seconds added to every API call (or (min, max) range)
+    error_rate:      probability that a call fails with APIError
+    error_status:    HTTP status of injected errors (429 quota by default)
+    quota_per_minute: max calls in any 60 s window, then 429 (None = no limit)
+    """
+
+    def __init__(self, data=None, path=None, latency=0.0, error_rate=0.0,
+                 error_status=429, quota_per_minute=None, seed=None):
+        if data is None and path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.path = path
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.quota_per_minute = quota_per_minute
+        self.calls = Counter()
+        self.lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._recent = deque()
+        self._spreadsheets = {
+            key: FakeSpreadsheet(self, key, tabs)
+            for key, tabs in (data or {}).items()
+        }
+
+    # ---------- fault / latency injection ----------
+    def api_call(self, method):
+        """Book-keeping for one simulated API request."""
+        with self.lock:
+            self.calls[method] += 1
+            now = time.monotonic()
+            if self.quota_per_minute is not None:
+                while self._recent and now - self._recent[0] > 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.quota_per_minute:
+                    raise APIError(_error_response(
+                        429, "Quota exceeded for quota metric 'Read requests'"
+                    ))
+                self._recent.append(now)
+            fail = self.error_rate and self._random.random() < self.error_rate
+            delay = self.latency
+            if isinstance(delay, (tuple, list)):
+                delay = self._random.uniform(*delay)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise APIError(_error_response(
+                self.error_status, f"Injected error on {method}"
+            ))
+
+    # ---------- gspread.Client subset ----------
+    def open_by_key(self, key):
+        self.api_call("open_by_key")
+        try:
+            return self._spreadsheets[key]
+        except KeyError:
+            raise SpreadsheetNotFound(key)
+
+    def create_spreadsheet(self, key, tabs=None):
+        """Add a spreadsheet ({title: rows}); not an API call."""
+        with self.lock:
+            spreadsheet = FakeSpreadsheet(self, key, tabs or {})
+            self._spreadsheets[key] = spreadsheet
+            return spreadsheet
+
+    # ---------- persistence ----------
+    def to_dict(self):
+        with self.lock:
+            return {
+                key: {ws.title: ws.rows for ws in ss.worksheets(count=False)}
+                for key, ss in self._spreadsheets.items()
+            }
+
+    def save(self, path=None):
+        """Write all data as JSON (atomic replace)."""
+        path = path or self.path
+        if not path:
+            return
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self.lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+
+# ====================================================
+# SPREADSHEET
+# ====================================================
+class FakeSpreadsheet:
+    """Stand-in for gspread.Spreadsheet."""
+
+    def __init__(self, client, key, tabs):
+        self.client = client
+        self.id = key
+        self.title = key
+        self._worksheets = {}
+        for title, rows in tabs.items():
+            self._add(title, rows)
+
+    def _add(self, title, rows):
+        ws = FakeWorksheet(self, title, len(self._worksheets), rows)
+        self._worksheets[title] = ws
+        return ws
+
+    def worksheet(self, title):
+        self.client.api_call("worksheet")
+        try:
+            return self._worksheets[title]
+        except KeyError:
+            raise WorksheetNotFound(title)
+
+    def worksheets(self, count=True):
+        if count:
+            self.client.api_call("worksheets")
+        return list(self._worksheets.values())
+
+    def add_worksheet(self, title, rows=1000, cols=26, index=None):
+        self.client.api_call("add_worksheet")
+        with self.client.lock:
+            return self._add(title, [])
+
+    def _tab(self, range_name):
+        title, cells = _split_range(range_name)
+        try:
+            return self._worksheets[title], cells
+        except KeyError:
+            raise APIError(_error_response(
+                400, f"Unable to parse range: {range_name}"
+            ))
+
+    def fetch_sheet_metadata(self, params=None):
+        self.client.api_call("fetch_sheet_metadata")
+        with self.client.lock:
+            sheets = [{"properties": {
+                "sheetId": ws.id,
+                "title": ws.title,
+                "index": ws.index,
+                "gridProperties": {
+                    "rowCount": len(ws.rows),
+                    "columnCount": max((len(row) for row in ws.rows), default=0),
+                },
+            }} for ws in self._worksheets.values()]
+        return {"spreadsheetId": self.id, "sheets": sheets}
+
+    def values_batch_get(self, ranges, params=None):
+        self.client.api_call("values_batch_get")
+        value_ranges = []
+        with self.client.lock:
+            for name in ranges:
+                ws, cells = self._tab(name)
+                entry = {"range": name, "majorDimension": "ROWS"}
+                values = ws._read(cells)
+                if values:
+                    entry["values"] = values
+                value_ranges.append(entry)
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def values_get(self, range_name, params=None):
+        self.client.api_call("values_get")
+        with self.client.lock:
+            ws, cells = self._tab(range_name)
+            values = ws._read(cells)
+        response = {"range": range_name, "majorDimension": "ROWS"}
+        if values:
+            response["values"] = values
+        return response
+
+    def values_batch_update(self, body=None):
+        self.client.api_call("values_batch_update")
+        body = body or {}
+        updated = 0
+        with self.client.lock:
+            for item in body.get("data", []):
+                ws, cells = self._tab(item["range"])
+                updated += ws._write(cells or "A1", item["values"])
+        self.client.save()
+        return {"spreadsheetId": self.id, "totalUpdatedCells": updated}
+
+
+# ====================================================
+# WORKSHEET
+# ====================================================
+class FakeWorksheet:
+    """Stand-in for gspread.Worksheet (values stored as strings)."""
+
+    def __init__(self, spreadsheet, title, index, rows):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.title = title
+        self.id = index
+        self.index = index
+        self.rows = [[_cell_text(v) for v in row] for row in rows]
+
+    # ---------- internals (no API accounting) ----------
+    def _read(self, cells=None):
+        values = _trimmed(self.rows)
+        if not cells:
+            return values
+        grid = a1_range_to_grid_range(cells)
+        r0 = grid.get("startRowIndex", 0)
+        r1 = grid.get("endRowIndex", len(values))
+        c0 = grid.get("startColumnIndex", 0)
+        c1 = grid.get("endColumnIndex")
+        return _trimmed(row[c0:c1] for row in values[r0:r1])
+
+    def _write(self, cells, block):
+        grid = a1_range_to_grid_range(cells.split(":")[0])
+        r0, c0 = grid["startRowIndex"], grid["startColumnIndex"]
+        count = 0
+        for r, row_values in enumerate(block, start=r0):
+            while len(self.rows) <= r:
+                self.rows.append([])
+            line = self.rows[r]
+            end = c0 + len(row_values)
+            if len(line) < end:
+                line.extend([""] * (end - len(line)))
+            line[c0:end] = [_cell_text(v) for v in row_values]
+            count += len(row_values)
+        return count
+
+    def _save(self):
+        self.client.save()
+
+    # ---------- reads ----------
+    def get_all_values(self, **kwargs):
+        self.client.api_call("get_all_values")
+        with self.client.lock:
+            return fill_gaps(self._read())
+
+    get_values = get_all_values
+
+    def get_all_records(self, **kwargs):
+        # Same header/numericise rules as gspread (calls get_all_values once)
+        return Worksheet.get_all_records(self, **kwargs)
+
+    def row_values(self, row, **kwargs):
+        self.client.api_call("row_values")
+        with self.client.lock:
+            values = self._read(f"A{row}:{row}")
+        return values[0] if values else []
+
+    def col_values(self, col, **kwargs):
+        self.client.api_call("col_values")
+        with self.client.lock:
+            values = [row[col - 1] if len(row) >= col else ""
+                      for row in self._read()]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    # ---------- writes ----------
+    def append_rows(self, values, value_input_option="RAW", **kwargs):
+        self.client.api_call("append_rows")
+        with self.client.lock:
+            start = len(_trimmed(self.rows)) + 1
+            del self.rows[start - 1:]
+            for row in values:
+                self.rows.append([_cell_text(v) for v in row])
+        self._save()
+        return {"updates": {
+            "updatedRange": f"{self.title}!A{start}",
+            "updatedRows": len(values),
+        }}
+
+    def append_row(self, values, value_input_option="RAW", **kwargs):
+        return self.append_rows([values], value_input_option, **kwargs)
+
+    def update_cell(self, row, col, value):
+        self.client.api_call("update_cell")
+        with self.client.lock:
+            self._write(rowcol_to_a1(row, col), [[value]])
+        self._save()
+        return {"updatedCells": 1}
+
+    def batch_update(self, data, **kwargs):
+        self.client.api_call("batch_update")
+        updated = 0
+        with self.client.lock:
+            for item in data:
+                cells = _split_range(item["range"])[1] or item["range"]
+                updated += self._write(cells, item["values"])
+        self._save()
+        return {"totalUpdatedCells": updated}
+
+    def update(self, range_name, values=None, **kwargs):
+        self.client.api_call("update")
+        with self.client.lock:
+            updated = self._write(range_name, values or [])
+        self._save()
+        return {"updatedCells": updated}
+
+    def delete_rows(self, start_index, end_index=None):
+        self.client.api_call("delete_rows")
+        end_index = end_index or start_index
+        with self.client.lock:
+            del self.rows[start_index - 1:end_index]
+        self._save()
+        return {}
+
+    def delete_columns(self, start_index, end_index=None):
+        self.client.api_call("delete_columns")
+        end_index = end_index or start_index
+        with self.client.lock:
+            for row in self.rows:
+                del row[start_index - 1:end_index]
+        self._save()
+        return {}
@@ -0,0 +1,92 @@
+"""
+ID Allocator Module
+One place that hands out new Candidate (CND), Company (CID) and Interview
+Record (IR) IDs
+- high-water mark per prefix cached in memory and advanced by every
+  reservation; the sheet column is only rescanned when the tab is
+  reloaded from outside (TTL reload, mirror sync, invalidate_sheet) –
+  the app's own appends do not trigger a rescan
+- next number = max(cached mark, highest ID in the sheet) + 1, so IDs
+  created elsewhere are picked up and a mark never goes backwards
+- reserve_ids() hands out a whole block at once for batch exports
+- one lock for every session of the process - two users saving at the
+  same moment never get the same ID
+"""
+
+import logging
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from sheets_connector import SHEET_ID, get_sheet_frame, sheet_load_version
+
+logger = logging.getLogger(__name__)
+
+# kind -> (worksheet, ID column names (first found is used), digits)
+ID_SEQUENCES = {
+    "candidate": ("Candidates", ("Candidate ID",), 4),
+    "company": ("CID", ("CID",), 4),
+    "record": ("Interview_Records", ("Record ID", "Record_ID"), 3),
+}
+
+_lock = threading.Lock()
+_marks = {}   # (sheet_id, kind, prefix) -> {"version": load version, "last": int}
+
+
+def _default_prefix(kind):
+    if kind == "candidate":
+        return f"CND{datetime.now().strftime('%Y%m%d')}"
+    if kind == "company":
+        return "CID"
+    return "IR"
+
+
+def _sheet_max(kind, prefix, sheet_id):
+    """Highest number used in the sheet for prefix (0 if none)."""
+    title, columns, _ = ID_SEQUENCES[kind]
+    df = get_sheet_frame(title, sheet_id)
+    column = next((c for c in columns if c in df.columns), None)
+    if column is None or df.empty:
+        return 0
+    ids = df[column].astype(str).str.strip()
+    numbers = pd.to_numeric(
+        ids[ids.str.startswith(prefix)].str[len(prefix):], errors="coerce"
+    )
+    return int(numbers.max()) if numbers.notna().any() else 0
+
+
+def reserve_ids(kind, count=1, prefix=None, sheet_id=SHEET_ID):
+    """
+    Reserve count consecutive IDs of kind ('candidate', 'company',
+    'record'); returns them as a list of strings. IDs are never handed out
+    twice by this process, even if they are never saved.
+    """
+    if count <= 0:
+        return []
+    _, _, digits = ID_SEQUENCES[kind]
+    prefix = prefix or _default_prefix(kind)
+    key = (sheet_id, kind, prefix)
+
+    with _lock:
+        mark = _marks.setdefault(key, {"version": None, "last": 0})
+        try:
+            version = sheet_load_version(ID_SEQUENCES[kind][0], sheet_id)
+            if version != mark["version"]:
+                mark["last"] = max(mark["last"], _sheet_max(kind, prefix, sheet_id))
+                mark["version"] = version
+        except Exception as e:
+            # Never seeded - counting from 0 would reuse IDs
+            if mark["version"] is None:
+                raise
+            # Sheet unreadable - keep counting from the cached mark
+            logger.warning(f"ID allocator could not read {kind} IDs: {e}")
+        first = mark["last"] + 1
+        mark["last"] += count
+
+    return [f"{prefix}{number:0{digits}d}" for number in range(first, first + count)]
+
+
+def next_id(kind, prefix=None, sheet_id=SHEET_ID):
+    """One new ID of kind (see reserve_ids)."""
+    return reserve_ids(kind, 1, prefix, sheet_id)[0]
@@ -1,276 +1,1228 @@
-# job_matcher_module.py
-# ====================================================
-# JOB MATCHING LOGIC MODULE (no Streamlit UI)
-# ====================================================
-
-import pandas as pd
-from rapidfuzz import fuzz
-from datetime import datetime
-
-
-# ====================================================
-# MATCHING ALGORITHM
-# ====================================================
-
-def calculate_field_match(val1, val2):
-    """Calculate match percentage between two values."""
-    if pd.isna(val1) or pd.isna(val2):
-        return 0
-
-    try:
-        # Numeric comparison (e.g. salary, experience)
-        v1 = float(val1)
-        v2 = float(val2)
-        if max(v1, v2) > 0:
-            diff_pct = abs(v1 - v2) / max(v1, v2)
-            if diff_pct <= 0.3:
-                return int(100 - (diff_pct * 100))
-        return 0
-    except Exception:
-        # String comparison using fuzzy matching
-        return fuzz.token_sort_ratio(
-            str(val1).lower().strip(),
-            str(val2).lower().strip()
-        )
-
-
-def match_candidate_to_companies(candidate_row, companies_df):
-    """Match one candidate to all companies, return top 5 matches."""
-    matches = []
-
-    for _, company_row in companies_df.iterrows():
-        critical_score = 0
-
-        # ------------------------------------------------
-        # 1) JOB TITLE (40%) – HARDEST FIRST CONDITION
-        # ------------------------------------------------
-        job_prefs = [
-            candidate_row.get('Job Pref 1', candidate_row.get('Job Preference 1')),
-            candidate_row.get('Job Pref 2', candidate_row.get('Job Preference 2')),
-            candidate_row.get('Job Pref 3', candidate_row.get('Job Preference 3')),
-        ]
-
-        job_title_match = 0
-        for jp in job_prefs:
-            if pd.notna(jp):
-                match_score = calculate_field_match(
-                    jp,
-                    company_row.get('Job Title')
-                )
-                if match_score > job_title_match:
-                    job_title_match = match_score
-
-        # ✅ HARD GATE: agar Job Pref 1/2/3 me se koi bhi
-        # Job Title se > 50 score nahi de raha, to ye
-        # candidate–company pair ko skip kar do.
-        if job_title_match <= 50:
-            continue
-
-        # yahan tak aate hi pakka hai ki kam se kam
-        # ek Job Pref achchha match hua hai
-        critical_score += job_title_match * 0.4
-
-        # ------------------------------------------------
-        # 2) LOCATION (30%)
-        # ------------------------------------------------
-        location_match = max(
-            calculate_field_match(
-                candidate_row.get('Preferred Location'),
-                company_row.get('City')
-            ),
-            calculate_field_match(
-                candidate_row.get('Current City'),
-                company_row.get('City')
-            ),
-        )
-        if location_match > 50:
-            critical_score += location_match * 0.3
-
-        # ------------------------------------------------
-        # 3) SALARY (30%)
-        # ------------------------------------------------
-        salary_match = calculate_field_match(
-            candidate_row.get('Expected Salary'),
-            company_row.get('Salary')
-        )
-        if salary_match > 50:
-            critical_score += salary_match * 0.3
-
-        # ------------------------------------------------
-        # 4) OPTIONAL FIELDS BONUS (20%)
-        # ------------------------------------------------
-        optional_scores = []
-
-        skills = calculate_field_match(
-            candidate_row.get('Technical Skills'),
-            company_row.get('Skills Required')
-        )
-        if skills > 50:
-            optional_scores.append(skills)
-
-        edu = calculate_field_match(
-            candidate_row.get('Graduation Degree'),
-            company_row.get('Education Required')
-        )
-        if edu > 50:
-            optional_scores.append(edu)
-
-        exp = calculate_field_match(
-            candidate_row.get('Experience Years'),
-            company_row.get('Experience Required')
-        )
-        if exp > 50:
-            optional_scores.append(exp)
-
-        if optional_scores:
-            avg_optional = sum(optional_scores) / len(optional_scores)
-            total_score = int(critical_score + (avg_optional * 0.2))
-        else:
-            total_score = int(critical_score)
-
-        # ------------------------------------------------
-        # 5) FINAL THRESHOLD
-        # ------------------------------------------------
-        if total_score >= 40:
-            matches.append({
-                'Candidate ID': candidate_row.get('Candidate ID'),
-                'Full Name': candidate_row.get('Full Name'),
-                'Company Name': company_row.get(
-                    'Company Name_y',
-                    company_row.get(
-                        'Company Name_x',
-                        company_row.get('Company Name')
-                    )
-                ),
-                'CID': company_row.get('CID'),
-                'Job Title': company_row.get('Job Title'),
-                'Match Score': total_score,
-                'Industry': company_row.get('Industry', 'N/A'),
-                'Contact': company_row.get('Contact Person', 'N/A'),
-                'Phone': company_row.get(
-                    'Contact Number_y',
-                    company_row.get('Contact Number_x', 'N/A')
-                ),
-                'Salary': company_row.get('Salary', 'N/A'),
-            })
-
-    return sorted(matches, key=lambda x: x['Match Score'], reverse=True)[:5]
-
-
-def run_matching(candidates_df, companies_df,
-                 progress_callback=None, status_callback=None):
-    """
-    Run matching for all candidates.
-
-    progress_callback: optional function(progress_float)
-    status_callback: optional function(status_text)
-    """
-    all_matches = []
-
-    total = len(candidates_df)
-    if total == 0:
-        return pd.DataFrame()
-
-    for idx, (_, candidate) in enumerate(candidates_df.iterrows()):
-        matches = match_candidate_to_companies(candidate, companies_df)
-        all_matches.extend(matches)
-
-        # Optional callbacks for UI (Streamlit etc.)
-        if progress_callback is not None:
-            progress_callback((idx + 1) / total)
-        if status_callback is not None:
-            status_callback(f"Processing: {idx + 1}/{total} candidates...")
-
-    return pd.DataFrame(all_matches)
-
-
-# ====================================================
-# EXPORT FUNCTIONS
-# ====================================================
-
-def get_existing_records(gc, sheet_id):
-    """Get existing interview records from Interview_Records sheet."""
-    sh = gc.open_by_key(sheet_id)
-    interview_sheet = sh.worksheet("Interview_Records")
-    existing_data = interview_sheet.get_all_values()
-
-    existing_ids = [row[0] for row in existing_data[1:] if len(row) > 0]
-    scheduled_pairs = set(
-        (row[2], row[5]) for row in existing_data[1:] if len(row) >= 6
-    )
-
-    return existing_ids, scheduled_pairs, interview_sheet
-
-
-def generate_record_id(existing_ids):
-    """Generate new interview record ID like IR001, IR002, ..."""
-    if len(existing_ids) == 0:
-        return "IR001"
-
-    numbers = [
-        int(rid[2:]) for rid in existing_ids
-        if isinstance(rid, str) and rid.startswith("IR") and len(rid) > 2
-    ]
-    if len(numbers) == 0:
-        return "IR001"
-
-    return f"IR{max(numbers) + 1:03d}"
-
-
-def create_record_row(match, record_id):
-    """Create one row for Interview_Records sheet."""
-    timestamp = datetime.now().strftime("%d-%b-%Y %H:%M:%S")
-    return [
-        record_id,
-        datetime.now().strftime("%d-%b-%Y"),
-        str(match['Candidate ID']),
-        str(match['Full Name']),
-        str(match['Company Name']),
-        str(match['CID']),
-        str(match['Job Title']),
-        f"{match['Match Score']}%",
-        "Matched",
-        "", "", "",
-        "Pending",
-        "", "", "",
-        timestamp,
-        "System",
-    ]
-
-
-def export_to_interview_sheet(gc, sheet_id, matches):
-    """
-    Export selected matches (list of dicts) to Interview_Records sheet.
-
-    Returns (success: bool, message: str)
-    """
-    existing_ids, scheduled_pairs, interview_sheet = get_existing_records(gc, sheet_id)
-
-    if interview_sheet is None:
-        return False, "Could not access Interview_Records sheet"
-
-    records_to_insert = []
-    added_count = 0
-    skipped_count = 0
-
-    for match in matches:
-        pair = (str(match['Candidate ID']), str(match['CID']))
-
-        if pair in scheduled_pairs:
-            skipped_count += 1
-            continue
-
-        record_id = generate_record_id(existing_ids)
-        existing_ids.append(record_id)
-        records_to_insert.append(create_record_row(match, record_id))
-        added_count += 1
-
-    if len(records_to_insert) > 0:
-        interview_sheet.append_rows(records_to_insert, value_input_option='USER_ENTERED')
-
-        message = f"Successfully added {added_count} records!"
-        if skipped_count > 0:
-            message += f" (Skipped {skipped_count} duplicates)"
-        return True, message
-
-    return False, "No new records to add (all duplicates)"
+# job_matcher_module.py
+# ====================================================
+# JOB MATCHING LOGIC MODULE (no Streamlit UI)
+# ====================================================
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+from datetime import datetime
+
+
+# ====================================================
+# MATCHING ALGORITHM
+# ====================================================
+
+def calculate_field_match(val1, val2):
+    """Calculate match percentage between two values."""
+    if pd.isna(val1) or pd.isna(val2):
+        return 0
+
+    try:
+        # Numeric comparison (e.g. salary, experience)
+        v1 = float(val1)
+        v2 = float(val2)
+        if max(v1, v2) > 0:
+            diff_pct = abs(v1 - v2) / max(v1, v2)
+            if diff_pct <= 0.3:
+                return int(100 - (diff_pct * 100))
+        return 0
+    except Exception:
+        # String comparison using fuzzy matching
+        return fuzz.token_sort_ratio(
+            str(val1).lower().strip(),
+            str(val2).lower().strip()
+        )
+
+
+def _job_title_match(pref_keys, vacancy_index, pos):
+    """
+    Best calculate_field_match(Job Pref, Job Title) for one vacancy,
+    using the pre-normalized title from the vacancy index.
+
+    Pairs that cannot score above 50 (see _title_gate_candidates) are
+    returned as 0 without calling the fuzzy scorer.
+    """
+    title = vacancy_index['title']
+    if title['isna'][pos]:
+        return 0
+
+    code = title['codes'][pos]
+    title_key = title['uniques'][code]
+    title_len = vacancy_index['title_lengths'][code]
+    title_chars = vacancy_index['title_chars'][code]
+    alphabet = vacancy_index['alphabet']
+
+    job_title_match = 0
+    for jp_num, jp_key, jp_counts in pref_keys:
+        if jp_num is not None and title['is_num'][pos]:
+            match_score = calculate_field_match(jp_num, title['num'][pos])
+        else:
+            total_len = len(jp_key) + title_len
+            shared = sum(
+                min(count, title_chars[alphabet[ch]])
+                for ch, count in jp_counts.items() if ch in alphabet
+            )
+            if total_len and 4 * shared <= total_len:
+                match_score = 0
+            else:
+                match_score = fuzz.ratio(jp_key, title_key)
+        if match_score > job_title_match:
+            job_title_match = match_score
+    return job_title_match
+
+
+def match_candidate_to_companies(candidate_row, companies_df, vacancy_index=None):
+    """
+    Match one candidate to all companies, return top 5 matches.
+
+    vacancy_index: optional build_vacancy_index(companies_df) result.
+    Pass it when matching many candidates so vacancy titles are
+    normalized once, not once per candidate.
+    """
+    if vacancy_index is None:
+        vacancy_index = build_vacancy_index(companies_df)
+
+    matches = []
+
+    job_prefs = [
+        candidate_row.get('Job Pref 1', candidate_row.get('Job Preference 1')),
+        candidate_row.get('Job Pref 2', candidate_row.get('Job Preference 2')),
+        candidate_row.get('Job Pref 3', candidate_row.get('Job Preference 3')),
+    ]
+    # Normalize / token-sort each preference once per candidate
+    pref_keys = []
+    for jp in job_prefs:
+        if pd.notna(jp):
+            jp_key = token_sort_key(jp)
+            pref_keys.append((_to_float(jp), jp_key, Counter(jp_key)))
+
+    for pos, (_, company_row) in enumerate(companies_df.iterrows()):
+        critical_score = 0
+
+        # ------------------------------------------------
+        # 1) JOB TITLE (40%) – HARDEST FIRST CONDITION
+        # ------------------------------------------------
+        job_title_match = _job_title_match(pref_keys, vacancy_index, pos)
+
+        # ✅ HARD GATE: agar Job Pref 1/2/3 me se koi bhi
+        # Job Title se > 50 score nahi de raha, to ye
+        # candidate–company pair ko skip kar do.
+        if job_title_match <= 50:
+            continue
+
+        # yahan tak aate hi pakka hai ki kam se kam
+        # ek Job Pref achchha match hua hai
+        critical_score += job_title_match * 0.4
+
+        # ------------------------------------------------
+        # 2) LOCATION (30%)
+        # ------------------------------------------------
+        location_match = max(
+            calculate_field_match(
+                candidate_row.get('Preferred Location'),
+                company_row.get('City')
+            ),
+            calculate_field_match(
+                candidate_row.get('Current City'),
+                company_row.get('City')
+            ),
+        )
+        if location_match > 50:
+            critical_score += location_match * 0.3
+
+        # ------------------------------------------------
+        # 3) SALARY (30%)
+        # ------------------------------------------------
+        salary_match = calculate_field_match(
+            candidate_row.get('Expected Salary'),
+            company_row.get('Salary')
+        )
+        if salary_match > 50:
+            critical_score += salary_match * 0.3
+
+        # ------------------------------------------------
+        # 4) OPTIONAL FIELDS BONUS (20%)
+        # ------------------------------------------------
+        optional_scores = []
+
+        skills = calculate_field_match(
+            candidate_row.get('Technical Skills'),
+            company_row.get('Skills Required')
+        )
+        if skills > 50:
+            optional_scores.append(skills)
+
+        edu = calculate_field_match(
+            candidate_row.get('Graduation Degree'),
+            company_row.get('Education Required')
+        )
+        if edu > 50:
+            optional_scores.append(edu)
+
+        exp = calculate_field_match(
+            candidate_row.get('Experience Years'),
+            company_row.get('Experience Required')
+        )
+        if exp > 50:
+            optional_scores.append(exp)
+
+        if optional_scores:
+            avg_optional = sum(optional_scores) / len(optional_scores)
+            total_score = int(critical_score + (avg_optional * 0.2))
+        else:
+            total_score = int(critical_score)
+
+        # ------------------------------------------------
+        # 5) FINAL THRESHOLD
+        # ------------------------------------------------
+        if total_score >= 40:
+            matches.append({
+                'Candidate ID': candidate_row.get('Candidate ID'),
+                'Full Name': candidate_row.get('Full Name'),
+                'Company Name': company_row.get(
+                    'Company Name_y',
+                    company_row.get(
+                        'Company Name_x',
+                        company_row.get('Company Name')
+                    )
+                ),
+                'CID': company_row.get('CID'),
+                'Job Title': company_row.get('Job Title'),
+                'Match Score': total_score,
+                'Industry': company_row.get('Industry', 'N/A'),
+                'Contact': company_row.get('Contact Person', 'N/A'),
+                'Phone': company_row.get(
+                    'Contact Number_y',
+                    company_row.get('Contact Number_x', 'N/A')
+                ),
+                'Salary': company_row.get('Salary', 'N/A'),
+            })
+
+    return sorted(matches, key=lambda x: x['Match Score'], reverse=True)[:5]
+
+
+# ====================================================
+# BATCH MATCHING ENGINE (vectorized)
+# ====================================================
+
+# Candidates scored per block. Keeps the pair matrices small
+# (block x vacancies) and decides how often progress is reported.
+MATCH_BLOCK_SIZE = 250
+
+JOB_PREF_COLUMNS = [
+    ('Job Pref 1', 'Job Preference 1'),
+    ('Job Pref 2', 'Job Preference 2'),
+    ('Job Pref 3', 'Job Preference 3'),
+]
+
+
+def _row_get(df, values, name, default=None):
+    """
+    Column-wise version of row.get(name, default).
+
+    `values` must be df.values, which is exactly what iterrows() builds
+    its row Series from, so every cell keeps the same Python type.
+    """
+    if name not in df.columns:
+        return [default] * len(values)
+    return list(values[:, df.columns.get_loc(name)])
+
+
+def _to_float(value):
+    """float(value) or None – same rule as calculate_field_match."""
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+# Whitespace rapidfuzz splits on in token_sort_ratio. Same as Python's
+# str.split() except NBSP (\xa0) and NEL (\x85), which stay inside tokens.
+_TOKEN_SPLIT = re.compile(
+    '[\t\n\x0b\x0c\r\x1c-\x1f \u1680\u2000-\u200a\u2028\u2029'
+    '\u202f\u205f\u3000]+'
+)
+
+
+def token_sort_key(text):
+    """
+    Normalized, token-sorted form of a text value.
+
+    fuzz.ratio() on two keys equals fuzz.token_sort_ratio() on the
+    lower/strip'ed originals, so keys can be built once and reused.
+    """
+    tokens = [t for t in _TOKEN_SPLIT.split(str(text).lower().strip()) if t]
+    return " ".join(sorted(tokens))
+
+
+def _encode_field(values, token_sort=False):
+    """
+    Turn one column into arrays for bulk scoring.
+
+    Returns dict with:
+      isna   – missing values (always score 0)
+      is_num – value parses as float (numeric tolerance path)
+      num    – parsed float (NaN when not numeric)
+      codes/uniques – factorized lower/strip text for fuzzy scoring
+                      (token-sorted keys when token_sort=True)
+    """
+    n = len(values)
+    isna = np.zeros(n, dtype=bool)
+    is_num = np.zeros(n, dtype=bool)
+    num = np.full(n, np.nan)
+    text = []
+
+    for i, value in enumerate(values):
+        if pd.isna(value):
+            isna[i] = True
+            text.append("")
+            continue
+        parsed = _to_float(value)
+        if parsed is not None:
+            is_num[i] = True
+            num[i] = parsed
+        if token_sort:
+            text.append(token_sort_key(value))
+        else:
+            text.append(str(value).lower().strip())
+
+    codes, uniques = pd.factorize(pd.Series(text, dtype=object))
+    return {
+        'isna': isna,
+        'is_num': is_num,
+        'num': num,
+        'codes': codes,
+        'uniques': list(uniques),
+    }
+
+
+def _take_field(field, rows):
+    """Slice an encoded field to the given row positions."""
+    return {
+        'isna': field['isna'][rows],
+        'is_num': field['is_num'][rows],
+        'num': field['num'][rows],
+        'codes': field['codes'][rows],
+        'uniques': field['uniques'],
+    }
+
+
+def _apply_numeric_rule(scores, a, b):
+    """
+    Overlay calculate_field_match's numeric and missing-value rules on
+    a text score matrix.
+    """
+    both_num = a['is_num'][:, None] & b['is_num'][None, :]
+    if both_num.any():
+        v1 = a['num'][:, None]
+        v2 = b['num'][None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            high = np.maximum(v1, v2)
+            diff_pct = np.abs(v1 - v2) / high
+            numeric = np.where(
+                (high > 0) & (diff_pct <= 0.3),
+                np.trunc(100 - (diff_pct * 100)),
+                0,
+            )
+        scores = np.where(both_num, numeric, scores)
+
+    scores[a['isna'][:, None] | b['isna'][None, :]] = 0
+    return scores
+
+
+def _field_score_matrix(a, b):
+    """
+    calculate_field_match() for every (a[i], b[j]) pair at once.
+
+    Text pairs are scored with one rapidfuzz cdist call over the unique
+    strings; pairs where both sides are numeric use the same 30%
+    tolerance rule in NumPy.
+    """
+    used_a = np.unique(a['codes'])
+    used_b = np.unique(b['codes'])
+    fuzzy = process.cdist(
+        [a['uniques'][k] for k in used_a],
+        [b['uniques'][k] for k in used_b],
+        scorer=fuzz.token_sort_ratio,
+        dtype=np.float64,
+    )
+    scores = fuzzy[np.ix_(
+        np.searchsorted(used_a, a['codes']),
+        np.searchsorted(used_b, b['codes']),
+    )]
+    return _apply_numeric_rule(scores, a, b)
+
+
+# ====================================================
+# VACANCY INDEX (pre-normalized, built once per snapshot)
+# ====================================================
+
+def _char_counts(texts, alphabet):
+    """Character count matrix (len(texts) x len(alphabet))."""
+    counts = np.zeros((len(texts), len(alphabet)), dtype=np.int32)
+    for i, text in enumerate(texts):
+        for ch in text:
+            col = alphabet.get(ch)
+            if col is not None:
+                counts[i, col] += 1
+    return counts
+
+
+def build_vacancy_index(companies_df, with_blocks=False):
+    """
+    Pre-normalized vacancy features used by the matcher.
+
+    Build once per get_vacancies() snapshot and pass it to
+    run_matching() / match_candidate_to_companies(). Holds:
+      title      – token-sorted, normalized Job Title keys
+      city, skills, education – normalized text
+      salary, experience      – parsed numeric values
+      title_lengths / title_chars – per unique title, used to reject
+                    job-title gate pairs without scoring them
+      title_blocks – optional {title token: vacancy positions}
+    """
+    values = companies_df.values
+
+    def field(name, token_sort=False):
+        return _encode_field(_row_get(companies_df, values, name), token_sort)
+
+    title = field('Job Title', token_sort=True)
+    alphabet = {
+        ch: i for i, ch in enumerate(sorted(set("".join(title['uniques']))))
+    }
+
+    title_blocks = None
+    if with_blocks:
+        title_blocks = {}
+        for pos, code in enumerate(title['codes']):
+            if title['isna'][pos]:
+                continue
+            for token in title['uniques'][code].split(" "):
+                if token:
+                    title_blocks.setdefault(token, []).append(pos)
+        title_blocks = {
+            token: np.array(positions)
+            for token, positions in title_blocks.items()
+        }
+
+    return {
+        'size': len(companies_df),
+        'title': title,
+        'title_lengths': np.array([len(t) for t in title['uniques']]),
+        'title_chars': _char_counts(title['uniques'], alphabet),
+        'alphabet': alphabet,
+        'title_blocks': title_blocks,
+        'city': field('City'),
+        'salary': field('Salary'),
+        'skills': field('Skills Required'),
+        'education': field('Education Required'),
+        'experience': field('Experience Required'),
+    }
+
+
+def block_vacancies(vacancy_index, job_prefs):
+    """
+    Vacancy positions sharing at least one title token with any of the
+    given job preferences (index must be built with_blocks=True).
+
+    Cheap candidate generation for previews and shortlists. The exact
+    matcher does not rely on it: fuzzy titles can pass the gate without
+    sharing a whole token.
+    """
+    blocks = vacancy_index.get('title_blocks') or {}
+    hits = set()
+    for jp in job_prefs:
+        if pd.isna(jp):
+            continue
+        for token in token_sort_key(jp).split(" "):
+            if token in blocks:
+                hits.update(blocks[token].tolist())
+    return np.array(sorted(hits), dtype=int)
+
+
+def _title_gate_candidates(pref_keys, vacancy_index):
+    """
+    Mask of (pref key, vacancy title) pairs that can still score > 50.
+
+    fuzz.ratio is 200 * LCS / (len1 + len2) and the LCS can never exceed
+    the shared character counts, so any pair with
+    4 * shared_chars <= len1 + len2 is rejected without being scored.
+    """
+    pref_lengths = np.array([len(k) for k in pref_keys])
+    pref_chars = _char_counts(pref_keys, vacancy_index['alphabet'])
+    title_chars = vacancy_index['title_chars']
+
+    shared = np.empty((len(pref_keys), len(title_chars)), dtype=np.int64)
+    for start in range(0, len(pref_keys), 64):
+        chunk = pref_chars[start:start + 64]
+        shared[start:start + 64] = np.minimum(
+            chunk[:, None, :], title_chars[None, :, :]
+        ).sum(axis=2)
+
+    total_len = pref_lengths[:, None] + vacancy_index['title_lengths'][None, :]
+    return (4 * shared > total_len) | (total_len == 0)
+
+
+def _title_score_matrix(pref, vacancy_index):
+    """
+    Job-title scores for one Job Pref column against every vacancy.
+
+    Only pairs surviving _title_gate_candidates are scored, with
+    fuzz.ratio on pre-sorted keys. Rejected pairs are set to 0; their
+    real score is <= 50 so the hard gate drops them either way.
+    """
+    title = vacancy_index['title']
+    used = np.unique(pref['codes'])
+    keys = [pref['uniques'][k] for k in used]
+
+    possible = _title_gate_candidates(keys, vacancy_index)
+    fuzzy = np.zeros(possible.shape)
+    rows = np.flatnonzero(possible.any(axis=1))
+    cols = np.flatnonzero(possible.any(axis=0))
+    if rows.size and cols.size:
+        fuzzy[np.ix_(rows, cols)] = process.cdist(
+            [keys[r] for r in rows],
+            [title['uniques'][c] for c in cols],
+            scorer=fuzz.ratio,
+            dtype=np.float64,
+        )
+        fuzzy[~possible] = 0
+
+    scores = fuzzy[np.ix_(np.searchsorted(used, pref['codes']), title['codes'])]
+    return _apply_numeric_rule(scores, pref, title)
+
+
+def _encode_candidates(candidates_df):
+    """Columnar arrays for every candidate field used in scoring."""
+    values = candidates_df.values
+
+    def field(name, fallback=None, token_sort=False):
+        if name not in candidates_df.columns and fallback is not None:
+            name = fallback
+        return _encode_field(_row_get(candidates_df, values, name), token_sort)
+
+    return {
+        'job_prefs': [
+            field(col, alt, token_sort=True) for col, alt in JOB_PREF_COLUMNS
+        ],
+        'preferred_location': field('Preferred Location'),
+        'current_city': field('Current City'),
+        'salary': field('Expected Salary'),
+        'skills': field('Technical Skills'),
+        'education': field('Graduation Degree'),
+        'experience': field('Experience Years'),
+    }
+
+
+def _score_block(cand, vac, rows):
+    """
+    Total match score for candidates[rows] x all vacancies.
+
+    `vac` is a build_vacancy_index() result. Mirrors
+    match_candidate_to_companies step by step (same weights, thresholds
+    and float operation order) and returns an int matrix where pairs
+    failing the job-title gate or the final 40% threshold are -1.
+    """
+    def scores(cand_field, vac_field):
+        return _field_score_matrix(_take_field(cand_field, rows), vac_field)
+
+    # 1) JOB TITLE (40%) – hard gate
+    job_title = np.zeros((len(rows), vac['size']))
+    for pref in cand['job_prefs']:
+        job_title = np.maximum(
+            job_title, _title_score_matrix(_take_field(pref, rows), vac)
+        )
+    passed = job_title > 50
+    critical = job_title * 0.4
+
+    # 2) LOCATION (30%)
+    location = np.maximum(
+        scores(cand['preferred_location'], vac['city']),
+        scores(cand['current_city'], vac['city']),
+    )
+    critical = np.where(location > 50, critical + location * 0.3, critical)
+
+    # 3) SALARY (30%)
+    salary = scores(cand['salary'], vac['salary'])
+    critical = np.where(salary > 50, critical + salary * 0.3, critical)
+
+    # 4) OPTIONAL FIELDS BONUS (20%)
+    optional_sum = np.zeros_like(critical)
+    optional_count = np.zeros(critical.shape, dtype=int)
+    for cand_key, vac_key in (('skills', 'skills'),
+                              ('education', 'education'),
+                              ('experience', 'experience')):
+        opt = scores(cand[cand_key], vac[vac_key])
+        ok = opt > 50
+        optional_sum = np.where(ok, optional_sum + opt, optional_sum)
+        optional_count += ok
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        with_bonus = critical + (optional_sum / optional_count) * 0.2
+    total = np.trunc(np.where(optional_count > 0, with_bonus, critical))
+
+    # 5) FINAL THRESHOLD
+    total = np.where(passed & (total >= 40), total, -1)
+    return total.astype(int)
+
+
+def _top_matches(total, top_n=5):
+    """
+    (row, vacancy, score) of the best `top_n` pairs per candidate.
+
+    Stable sort keeps vacancy order on equal scores, same as sorted()
+    in match_candidate_to_companies.
+    """
+    order = np.argsort(-total, axis=1, kind='stable')[:, :top_n]
+    best = np.take_along_axis(total, order, axis=1)
+    rows, ranks = np.nonzero(best >= 0)
+    return rows, order[rows, ranks], best[rows, ranks]
+
+
+def _build_match_records(candidates_df, companies_df, cand_pos, vac_pos, scores):
+    """Build the match dicts exactly like match_candidate_to_companies."""
+    c_values = candidates_df.values
+    v_values = companies_df.values
+
+    def cand_col(name, default=None):
+        return _row_get(candidates_df, c_values, name, default)
+
+    def vac_col(name, default=None):
+        return _row_get(companies_df, v_values, name, default)
+
+    company_name = vac_col('Company Name')
+    if 'Company Name_x' in companies_df.columns:
+        company_name = vac_col('Company Name_x')
+    if 'Company Name_y' in companies_df.columns:
+        company_name = vac_col('Company Name_y')
+
+    phone = vac_col('Contact Number_x', 'N/A')
+    if 'Contact Number_y' in companies_df.columns:
+        phone = vac_col('Contact Number_y')
+
+    candidate_id = cand_col('Candidate ID')
+    full_name = cand_col('Full Name')
+    cid = vac_col('CID')
+    job_title = vac_col('Job Title')
+    industry = vac_col('Industry', 'N/A')
+    contact = vac_col('Contact Person', 'N/A')
+    salary = vac_col('Salary', 'N/A')
+
+    records = []
+    for i, j, score in zip(cand_pos, vac_pos, scores):
+        records.append({
+            'Candidate ID': candidate_id[i],
+            'Full Name': full_name[i],
+            'Company Name': company_name[j],
+            'CID': cid[j],
+            'Job Title': job_title[j],
+            'Match Score': int(score),
+            'Industry': industry[j],
+            'Contact': contact[j],
+            'Phone': phone[j],
+            'Salary': salary[j],
+        })
+    return records
+
+
+def _match_block(cand, vac, rows):
+    """(candidate position, vacancy position, score) of top matches for rows."""
+    block_rows, vac_pos, scores = _top_matches(_score_block(cand, vac, rows))
+    return rows[block_rows], vac_pos, scores
+
+
+def _pair_block(cand, vac, rows):
+    """(candidate position, vacancy position, score) of every pair >= 40 for rows."""
+    scores = _score_block(cand, vac, rows)
+    i, j = np.nonzero(scores >= 0)
+    return rows[i], j, scores[i, j]
+
+
+def _slice_vacancies(vac, rows):
+    """
+    Vacancy index restricted to rows (positions in the result are
+    0..len(rows)-1). Title uniques are kept, so the per-unique gate
+    arrays stay valid; title_blocks are dropped (not used in scoring).
+    """
+    sliced = dict(vac)
+    for key in ('title', 'city', 'salary', 'skills', 'education', 'experience'):
+        sliced[key] = _take_field(vac[key], rows)
+    sliced['size'] = len(rows)
+    sliced['title_blocks'] = None
+    return sliced
+
+
+def _slice_candidates(cand, rows):
+    """
+    Encoded candidates restricted to rows, with uniques compacted so a
+    chunk pickles small when sent to a worker process.
+    """
+    def compact(field):
+        part = _take_field(field, rows)
+        used = np.unique(part['codes'])
+        part['codes'] = np.searchsorted(used, part['codes'])
+        part['uniques'] = [field['uniques'][k] for k in used]
+        return part
+
+    return {
+        key: [compact(f) for f in value] if isinstance(value, list) else compact(value)
+        for key, value in cand.items()
+    }
+
+
+# ====================================================
+# PARALLEL MATCHING (process pool)
+# ====================================================
+
+# Vacancy index of the current worker process, set once by the pool
+# initializer so tasks only carry their candidate chunk.
+_worker_vacancy_index = None
+
+
+def _init_match_worker(vacancy_index):
+    global _worker_vacancy_index
+    _worker_vacancy_index = vacancy_index
+
+
+def _match_chunk(cand_chunk, all_pairs=False):
+    """
+    Worker task: score one candidate chunk against the worker's index.
+    Top matches per candidate, or every pair >= 40 with all_pairs.
+    """
+    block = _pair_block if all_pairs else _match_block
+    n = len(cand_chunk['salary']['isna'])
+    parts = [
+        block(
+            cand_chunk, _worker_vacancy_index,
+            np.arange(start, min(start + MATCH_BLOCK_SIZE, n)),
+        )
+        for start in range(0, n, MATCH_BLOCK_SIZE)
+    ]
+    return tuple(np.concatenate(p) for p in zip(*parts))
+
+
+def _match_parallel(cand, vac, total, workers, report, all_pairs=False):
+    """
+    Score candidates in chunks on a ProcessPoolExecutor (see _match_chunk
+    for all_pairs).
+
+    Progress is reported as chunks complete; results are put back in
+    chunk order so the output matches the serial run exactly.
+    """
+    chunk_size = max(MATCH_BLOCK_SIZE, -(-total // (workers * 4)))
+    starts = list(range(0, total, chunk_size))
+    results = {}
+    done = 0
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_match_worker,
+        initargs=(vac,),
+    ) as pool:
+        futures = {}
+        for start in starts:
+            rows = np.arange(start, min(start + chunk_size, total))
+            chunk = _slice_candidates(cand, rows)
+            futures[pool.submit(_match_chunk, chunk, all_pairs)] = (start, len(rows))
+
+        for future in as_completed(futures):
+            start, size = futures[future]
+            cand_pos, vac_pos, scores = future.result()
+            results[start] = (cand_pos + start, vac_pos, scores)
+            done += size
+            report(done)
+
+    return [results[start] for start in starts]
+
+
+# ====================================================
+# INCREMENTAL MATCHING (persisted match-score store)
+# ====================================================
+
+# Bump when scoring rules change so old stores are discarded
+MATCH_STORE_VERSION = 1
+
+CANDIDATE_SCORED_COLUMNS = [
+    'Preferred Location', 'Current City', 'Expected Salary',
+    'Technical Skills', 'Graduation Degree', 'Experience Years',
+]
+VACANCY_SCORED_COLUMNS = [
+    'Job Title', 'City', 'Salary',
+    'Skills Required', 'Education Required', 'Experience Required',
+]
+
+
+def load_match_store(path):
+    """
+    Load the match-score store saved by a previous run.
+
+    Store layout:
+      candidates – Series: candidate key -> fingerprint of scored fields
+      vacancies  – Series: vacancy key -> fingerprint of scored fields
+      pairs      – DataFrame(cand_key, vac_key, score) of every pair
+                   scoring >= 40 (not just the top 5, so removing a
+                   vacancy can promote the next best one)
+    """
+    empty = {
+        'version': MATCH_STORE_VERSION,
+        'candidates': pd.Series(dtype=object),
+        'vacancies': pd.Series(dtype=object),
+        'pairs': pd.DataFrame({
+            'cand_key': pd.Series(dtype=object),
+            'vac_key': pd.Series(dtype=object),
+            'score': pd.Series(dtype=int),
+        }),
+    }
+    if not path or not os.path.exists(path):
+        return empty
+    try:
+        with open(path, 'rb') as f:
+            store = pickle.load(f)
+        if store.get('version') != MATCH_STORE_VERSION:
+            return empty
+        return store
+    except Exception:
+        return empty
+
+
+def save_match_store(store, path):
+    """
+    Write the store atomically (temp file + rename). Every save gets its
+    own temp file, so two sessions saving at once never mix their writes.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=folder or None, prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _row_keys(parts):
+    """
+    Stable row keys from key columns, e.g. (Candidate ID,) or
+    (CID, Job Title). Repeated keys get an occurrence suffix so every
+    row stays addressable.
+    """
+    seen = {}
+    keys = []
+    for values in zip(*parts):
+        base = "\x1f".join(str(v).strip() for v in values)
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        keys.append(base if occurrence == 0 else f"{base}\x1f#{occurrence}")
+    return keys
+
+
+def _fingerprints(df, columns):
+    """Content hash of the given columns for every row."""
+    values = df.values
+    cols = [_row_get(df, values, name) for name in columns]
+    return [
+        hashlib.sha1("\x1f".join(repr(v) for v in row).encode('utf-8')).hexdigest()
+        for row in zip(*cols)
+    ]
+
+
+def _candidate_keys(candidates_df):
+    values = candidates_df.values
+    keys = _row_keys([_row_get(candidates_df, values, 'Candidate ID')])
+    pref_columns = [
+        col if col in candidates_df.columns else alt
+        for col, alt in JOB_PREF_COLUMNS
+    ]
+    return keys, _fingerprints(candidates_df, pref_columns + CANDIDATE_SCORED_COLUMNS)
+
+
+def _vacancy_keys(companies_df):
+    values = companies_df.values
+    keys = _row_keys([
+        _row_get(companies_df, values, 'CID'),
+        _row_get(companies_df, values, 'Job Title'),
+    ])
+    return keys, _fingerprints(companies_df, VACANCY_SCORED_COLUMNS)
+
+
+def _dirty_positions(keys, fingerprints, stored):
+    """Positions of rows that are new or whose fingerprint changed."""
+    previous = stored.reindex(keys)
+    return np.flatnonzero(previous.values != np.array(fingerprints, dtype=object))
+
+
+def _all_pairs(candidates_df, vac, cand_rows, report=None, workers=None):
+    """
+    Every (candidate, vacancy, score) pair scoring >= 40 for the given
+    candidate rows against the vacancy index vac (process pool when
+    workers > 1). report(n) is called with the number of rows just done.
+    """
+    cand = _encode_candidates(candidates_df.iloc[cand_rows])
+    total = len(cand_rows)
+
+    def step(n):
+        if report is not None:
+            report(n)
+
+    if workers is not None and workers > 1 and total > MATCH_BLOCK_SIZE:
+        reported = [0]
+
+        def progress(done):
+            step(done - reported[0])
+            reported[0] = done
+
+        parts = _match_parallel(cand, vac, total, workers, progress, all_pairs=True)
+    else:
+        parts = []
+        for start in range(0, total, MATCH_BLOCK_SIZE):
+            rows = np.arange(start, min(start + MATCH_BLOCK_SIZE, total))
+            parts.append(_pair_block(cand, vac, rows))
+            step(len(rows))
+    if not parts:
+        return np.array([], dtype=int), np.array([], dtype=int), np.array([], dtype=int)
+    ci, vj, sc = (np.concatenate(p) for p in zip(*parts))
+    return cand_rows[ci], vj, sc
+
+
+def _run_matching_incremental(candidates_df, companies_df, store_path,
+                              report, status_callback,
+                              vacancy_index=None, workers=None):
+    """
+    Re-score only what changed since the last run.
+
+    New / changed candidates are scored against every vacancy, and
+    unchanged candidates only against new / changed vacancies. Pairs of
+    unchanged rows are reused from the store; rows that disappeared are
+    dropped. Top 5 per candidate is then rebuilt in the current
+    candidate and vacancy order, so the result equals a full run.
+    Scoring uses vacancy_index (built here if None) and a process pool
+    when workers > 1.
+    """
+    store = load_match_store(store_path)
+    vac = vacancy_index
+    if vac is None:
+        vac = build_vacancy_index(companies_df)
+
+    cand_keys, cand_fps = _candidate_keys(candidates_df)
+    vac_keys, vac_fps = _vacancy_keys(companies_df)
+
+    dirty_cand = _dirty_positions(cand_keys, cand_fps, store['candidates'])
+    dirty_vac = _dirty_positions(vac_keys, vac_fps, store['vacancies'])
+
+    cand_key_arr = np.array(cand_keys, dtype=object)
+    vac_key_arr = np.array(vac_keys, dtype=object)
+    clean_cand = np.setdiff1d(np.arange(len(cand_keys)), dirty_cand)
+    clean_vac = np.setdiff1d(np.arange(len(vac_keys)), dirty_vac)
+
+    if status_callback is not None:
+        status_callback(
+            f"Re-scoring {len(dirty_cand)} changed candidates and "
+            f"{len(dirty_vac)} changed vacancies..."
+        )
+
+    pairs = store['pairs']
+    kept = pairs[
+        pairs['cand_key'].isin(cand_key_arr[clean_cand])
+        & pairs['vac_key'].isin(vac_key_arr[clean_vac])
+    ]
+
+    work_total = len(dirty_cand) + (len(clean_cand) if len(dirty_vac) else 0)
+    done = [0]
+
+    def step(n):
+        done[0] += n
+        report(done[0], work_total)
+
+    new_parts = []
+    if len(dirty_cand):
+        new_parts.append(_all_pairs(candidates_df, vac, dirty_cand, step, workers))
+    if len(dirty_vac) and len(clean_cand):
+        ci, vj, sc = _all_pairs(
+            candidates_df, _slice_vacancies(vac, dirty_vac), clean_cand, step, workers
+        )
+        new_parts.append((ci, dirty_vac[vj], sc))
+
+    new_pairs = [kept]
+    for ci, vj, sc in new_parts:
+        new_pairs.append(pd.DataFrame({
+            'cand_key': cand_key_arr[ci],
+            'vac_key': vac_key_arr[vj],
+            'score': sc.astype(int),
+        }))
+    changed = (
+        len(dirty_cand) or len(dirty_vac) or len(kept) != len(pairs)
+        or len(store['candidates']) != len(cand_keys)
+        or len(store['vacancies']) != len(vac_keys)
+    )
+    pairs = pd.concat(new_pairs, ignore_index=True)
+
+    if changed:
+        # Categorical keys keep the pickle small and fast to load
+        pairs = pairs.astype({'cand_key': 'category', 'vac_key': 'category'})
+        save_match_store({
+            'version': MATCH_STORE_VERSION,
+            'candidates': pd.Series(cand_fps, index=cand_keys, dtype=object),
+            'vacancies': pd.Series(vac_fps, index=vac_keys, dtype=object),
+            'pairs': pairs,
+        }, store_path)
+
+    # Top 5 per candidate: score desc, then vacancy order (stable sort)
+    cand_pos = pd.Index(cand_keys).get_indexer(pairs['cand_key'])
+    vac_pos = pd.Index(vac_keys).get_indexer(pairs['vac_key'])
+    scores = pairs['score'].to_numpy(dtype=int)
+    order = np.lexsort((vac_pos, -scores, cand_pos))
+    ranked = pd.DataFrame({
+        'cand': cand_pos[order], 'vac': vac_pos[order], 'score': scores[order]
+    })
+    ranked = ranked[ranked.groupby('cand').cumcount() < 5]
+    return (
+        ranked['cand'].to_numpy(),
+        ranked['vac'].to_numpy(),
+        ranked['score'].to_numpy(),
+    )
+
+
+def run_matching(candidates_df, companies_df,
+                 progress_callback=None, status_callback=None,
+                 vacancy_index=None, workers=None, store_path=None):
+    """
+    Run matching for all candidates.
+
+    Uses the vectorized batch engine: both frames are converted to
+    columnar arrays once and candidates are scored block by block
+    against every vacancy. Output is identical to calling
+    match_candidate_to_companies() for each candidate in order.
+
+    progress_callback: optional function(progress_float)
+    status_callback: optional function(status_text)
+    vacancy_index: optional build_vacancy_index(companies_df) result
+    workers: optional process count; > 1 scores candidate chunks in a
+             process pool (each worker receives the vacancy index once)
+    store_path: optional match-score store file; when given only new or
+                changed candidates/vacancies are scored (see
+                _run_matching_incremental), still with vacancy_index
+                and workers
+    """
+    total = len(candidates_df)
+    if total == 0:
+        return pd.DataFrame()
+
+    def report(done):
+        # Optional callbacks for UI (Streamlit etc.)
+        if progress_callback is not None:
+            progress_callback(done / total)
+        if status_callback is not None:
+            status_callback(f"Processing: {done}/{total} candidates...")
+
+    if len(companies_df) == 0:
+        report(total)
+        return pd.DataFrame()
+
+    if store_path is not None:
+        cand_pos, vac_pos, scores = _run_matching_incremental(
+            candidates_df, companies_df, store_path,
+            lambda done, work: report(total if work == 0 else round(total * done / work)),
+            status_callback,
+            vacancy_index=vacancy_index,
+            workers=workers,
+        )
+        report(total)
+        all_matches = _build_match_records(
+            candidates_df, companies_df, cand_pos, vac_pos, scores
+        )
+        return pd.DataFrame(all_matches)
+
+    cand = _encode_candidates(candidates_df)
+    vac = vacancy_index
+    if vac is None:
+        vac = build_vacancy_index(companies_df)
+
+    if workers is not None and workers > 1 and total > MATCH_BLOCK_SIZE:
+        parts = _match_parallel(cand, vac, total, workers, report)
+    else:
+        parts = []
+        for start in range(0, total, MATCH_BLOCK_SIZE):
+            rows = np.arange(start, min(start + MATCH_BLOCK_SIZE, total))
+            parts.append(_match_block(cand, vac, rows))
+            report(rows[-1] + 1)
+
+    cand_pos, vac_pos, scores = (np.concatenate(p) for p in zip(*parts))
+    all_matches = _build_match_records(
+        candidates_df, companies_df, cand_pos, vac_pos, scores
+    )
+    return pd.DataFrame(all_matches)
+
+
+# ====================================================
+# EXPORT FUNCTIONS
+# ====================================================
+# Rows per append_rows request – one request for 15k rows times out
+EXPORT_CHUNK_SIZE = 500
+
+def get_existing_records(gc, sheet_id):
+    """
+    Get existing interview records from Interview_Records sheet.
+
+    The worksheet handle comes from the shared sheets_connector cache;
+    gc is kept for backward compatibility. Imported here so the matching
+    engine (and its worker processes) stays free of Streamlit imports.
+    """
+    from sheets_connector import get_worksheet
+
+    interview_sheet = get_worksheet("Interview_Records", sheet_id)
+    existing_data = interview_sheet.get_all_values()
+
+    existing_ids = [row[0] for row in existing_data[1:] if len(row) > 0]
+    # Stripped like the keys of sheets_connector.row_keys()
+    scheduled_pairs = set(
+        (str(row[2]).strip(), str(row[5]).strip())
+        for row in existing_data[1:] if len(row) >= 6
+    )
+
+    return existing_ids, scheduled_pairs, interview_sheet
+
+
+def generate_record_id(existing_ids=None):
+    """
+    Generate new interview record ID like IR001, IR002, ...
+
+    existing_ids is unused (kept for old callers) – the shared allocator
+    keeps the high-water mark of Interview_Records.
+    """
+    from id_allocator import reserve_ids
+
+    return reserve_ids("record")[0]
+
+
+def create_record_row(match, record_id):
+    """Create one row for Interview_Records sheet."""
+    timestamp = datetime.now().strftime("%d-%b-%Y %H:%M:%S")
+    return [
+        record_id,
+        datetime.now().strftime("%d-%b-%Y"),
+        str(match['Candidate ID']),
+        str(match['Full Name']),
+        str(match['Company Name']),
+        str(match['CID']),
+        str(match['Job Title']),
+        f"{match['Match Score']}%",
+        "Matched",
+        "", "", "",
+        "Pending",
+        "", "", "",
+        timestamp,
+        "System",
+    ]
+
+
+def _new_matches(matches_df, sheet_id):
+    """
+    (rows of matches_df to insert, skipped count): pairs (Candidate ID, CID)
+    already in Interview_Records – looked up in the cached row index, no
+    full read – and exact repeats (same Candidate ID, CID and Job Title)
+    inside the batch are dropped.
+    """
+    from sheets_connector import row_keys
+
+    existing = row_keys("Interview_Records", ("Candidate ID", "CID"), sheet_id)
+    if existing is None:
+        _, existing, _ = get_existing_records(None, sheet_id)
+
+    candidate_ids = matches_df['Candidate ID'].astype(str).str.strip()
+    cids = matches_df['CID'].astype(str).str.strip()
+    pairs = pd.Series(list(zip(candidate_ids, cids)), index=matches_df.index)
+    # Two jobs at one company are two records - only exact repeats go
+    repeats = pd.DataFrame({
+        'cand': candidate_ids, 'cid': cids,
+        'job': matches_df['Job Title'].astype(str).str.strip(),
+    }).duplicated()
+    keep = ~pairs.isin(existing) & ~repeats
+    return matches_df[keep], int((~keep).sum())
+
+
+def export_matches_stream(sheet_id, matches, chunk_size=EXPORT_CHUNK_SIZE,
+                          progress_callback=None):
+    """
+    Export matches (DataFrame or list of dicts) to Interview_Records in
+    append_rows chunks of chunk_size rows.
+
+    Each committed chunk is in the cached tab at once, so a retry after a
+    failure skips it (dedup) and continues with the remaining rows. Record
+    IDs are reserved per chunk.
+
+    progress_callback: optional function(rows_written, rows_to_write)
+    Returns (added, skipped, error message or None)
+    """
+    from id_allocator import reserve_ids
+    from sheets_connector import append_rows, invalidate_sheet
+
+    matches_df = matches if isinstance(matches, pd.DataFrame) else pd.DataFrame(matches)
+    if matches_df.empty:
+        return 0, 0, None
+
+    try:
+        to_insert, skipped = _new_matches(matches_df, sheet_id)
+    except Exception as e:
+        # Interview_Records could not be read for the duplicate check
+        return 0, 0, str(e)
+    total = len(to_insert)
+    added = 0
+
+    for start in range(0, total, chunk_size):
+        chunk = to_insert.iloc[start:start + chunk_size].to_dict('records')
+        record_ids = reserve_ids("record", len(chunk), sheet_id=sheet_id)
+        rows = [
+            create_record_row(match, record_id)
+            for match, record_id in zip(chunk, record_ids)
+        ]
+        try:
+            # Also appends the rows to the cached Interview_Records tab
+            append_rows("Interview_Records", rows, sheet_id, value_input_option='USER_ENTERED')
+        except Exception as e:
+            # A timed-out chunk may still have been written - re-read the
+            # tab before the next attempt so dedup sees it
+            invalidate_sheet("Interview_Records", sheet_id)
+            return added, skipped, str(e)
+        added += len(rows)
+        if progress_callback is not None:
+            progress_callback(added, total)
+
+    return added, skipped, None
+
+
+def export_to_interview_sheet(gc, sheet_id, matches):
+    """
+    Export selected matches (list of dicts or DataFrame) to
+    Interview_Records sheet (see export_matches_stream).
+
+    Returns (success: bool, message: str)
+    """
+    added_count, skipped_count, error = export_matches_stream(sheet_id, matches)
+
+    if error is not None:
+        message = (
+            f"Export stopped after {added_count} records: {error}. "
+            "Export again to continue – records already added are skipped."
+        )
+        return False, message
+
+    if added_count > 0:
+        message = f"Successfully added {added_count} records!"
+        if skipped_count > 0:
+            message += f" (Skipped {skipped_count} duplicates)"
+        return True, message
+
+    return False, "No new records to add (all duplicates)"
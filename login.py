@@ -1,464 +1,874 @@
-import streamlit as st
-import gspread
-from google.oauth2.service_account import Credentials
-import hashlib
-from datetime import datetime
-import pandas as pd
-
-# -------------------------------------------------------
-# PAGE CONFIG (top-level)
-# -------------------------------------------------------
-#st.set_page_config(
-   # page_title="Placement Agency - Login",
-   # page_icon="🔐",
-    #layout="centered",
-    #initial_sidebar_state="collapsed"
-#)
-
-# =======================================================
-# GOOGLE SHEETS CONFIG FOR LOGIN
-# =======================================================
-SHEET_ID = "1rpuXdpfwjy0BQcaZcn0Acbh-Se6L3PvyNGiNu4NLcPA"
-
-
-@st.cache_resource
-def get_google_sheets_client():
-    """Cached Google Sheets client for login - using st.secrets"""
-    try:
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Use st.secrets instead of credentials.json
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scope
-        )
-        client = gspread.authorize(credentials)
-        return client
-    except Exception as e:
-        st.error(f"Google Sheets connection error: {str(e)}")
-        return None
-
-
-# =======================================================
-# USER AUTHENTICATION FUNCTIONS
-# =======================================================
-def get_users_from_sheet():
-    """Fetch all users from Google Sheets 'Users' tab"""
-    try:
-        client = get_google_sheets_client()
-        if not client:
-            return None
-
-        sheet = client.open_by_key(SHEET_ID).worksheet("Users")
-        data = sheet.get_all_records()
-
-        if not data:
-            return None
-
-        df = pd.DataFrame(data)
-        return df
-
-    except Exception as e:
-        st.error(f"Error fetching users: {str(e)}")
-        return None
-
-
-def verify_credentials(username, password):
-    """Verify username and password against Google Sheets"""
-    df = get_users_from_sheet()
-
-    if df is None or df.empty:
-        st.error("❌ Unable to fetch user data from Google Sheets")
-        return None
-
-    # Filter user
-    user = df[df['Username'].str.lower() == username.lower()]
-
-    if user.empty:
-        return None
-
-    # Get stored password hash
-    stored_hash = user.iloc[0]['Password']
-
-    # Hash input password
-    input_hash = hashlib.sha256(password.encode()).hexdigest()
-
-    # Verify password
-    if stored_hash == input_hash:
-        return {
-            'username': user.iloc[0]['Username'],
-            'role': user.iloc[0]['Role'],
-            'full_name': user.iloc[0].get('Full Name', username),
-            'email': user.iloc[0].get('Email', ''),
-            'status': user.iloc[0].get('Status', 'Active')
-        }
-
-    return None
-
-
-def log_login_activity(username, status, ip_address="N/A"):
-    """Log login attempts to Google Sheets 'Login_Logs' tab"""
-    try:
-        client = get_google_sheets_client()
-        if not client:
-            return False
-
-        sheet = client.open_by_key(SHEET_ID).worksheet("Login_Logs")
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        row = [timestamp, username, status, ip_address]
-        sheet.append_row(row)
-
-        return True
-    except Exception as e:
-        print(f"Error logging activity: {str(e)}")
-        return False
-
-
-# =======================================================
-# USER MANAGEMENT FUNCTIONS (Admin Only)
-# =======================================================
-def add_new_user(username, password, role, full_name, email):
-    """Add new user to Google Sheets (Admin function)"""
-    try:
-        client = get_google_sheets_client()
-        if not client:
-            return False
-
-        sheet = client.open_by_key(SHEET_ID).worksheet("Users")
-
-        # Check if username already exists
-        df = get_users_from_sheet()
-        if df is not None and username.lower() in df['Username'].str.lower().values:
-            st.error(f"❌ Username '{username}' already exists!")
-            return False
-
-        # Hash password
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        # Create user row
-        created_date = datetime.now().strftime("%Y-%m-%d")
-        row = [username, password_hash, role, full_name, email, "Active", created_date]
-
-        sheet.append_row(row)
-        return True
-
-    except Exception as e:
-        st.error(f"Error adding user: {str(e)}")
-        return False
-
-
-def change_password(username, new_password):
-    """Change user password"""
-    try:
-        client = get_google_sheets_client()
-        if not client:
-            return False
-
-        sheet = client.open_by_key(SHEET_ID).worksheet("Users")
-        df = pd.DataFrame(sheet.get_all_records())
-
-        # Find user row
-        user_idx = df[df['Username'].str.lower() == username.lower()].index
-
-        if user_idx.empty:
-            return False
-
-        # Update password (row number = index + 2, because header is row 1)
-        row_num = user_idx[0] + 2
-        new_hash = hashlib.sha256(new_password.encode()).hexdigest()
-
-        sheet.update_cell(row_num, 2, new_hash)  # Column 2 = Password
-        return True
-
-    except Exception as e:
-        st.error(f"Error changing password: {str(e)}")
-        return False
-
-
-# =======================================================
-# LOGIN UI
-# =======================================================
-def render_login():
-    """Render stable login page with Google Sheets authentication"""
-
-    # Custom CSS
-    st.markdown(
-        """
-        <style>
-        /* Prevent layout shift */
-        .stTextInput > div > div > input {
-            transition: none !important;
-        }
-
-        .stTextInput {
-            min-height: 70px;
-        }
-
-        /* Center content */
-        .main .block-container {
-            max-width: 500px;
-            padding-top: 3rem;
-        }
-
-        /* Remove Streamlit branding */
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-
-        /* Custom header */
-        .login-header {
-            text-align: center;
-            padding: 2rem 0;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 10px;
-            color: white;
-            margin-bottom: 2rem;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # Header
-    st.markdown(
-        """
-        <div class="login-header">
-            <h1>🔐 Placement Agency</h1>
-            <p>Management System Login</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # Initialize session state
-    if "login_username" not in st.session_state:
-        st.session_state.login_username = ""
-    if "login_password" not in st.session_state:
-        st.session_state.login_password = ""
-
-    # Login form
-    with st.form("login_form", clear_on_submit=False):
-        st.markdown("### 🔑 Enter Your Credentials")
-
-        username = st.text_input(
-            "Username",
-            value=st.session_state.login_username,
-            key="username_input",
-            placeholder="Enter your username",
-            autocomplete="username",
-        )
-
-        password = st.text_input(
-            "Password",
-            value=st.session_state.login_password,
-            type="password",
-            key="password_input",
-            placeholder="Enter your password",
-            autocomplete="current-password",
-        )
-
-        # Remember me checkbox (abhi use nahi kar rahe)
-        remember_me = st.checkbox("Remember me", value=False)
-
-        # Login button
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            submitted = st.form_submit_button("🔓 Login", use_container_width=True)
-
-        # Process login
-        if submitted:
-            if not username or not password:
-                st.error("❌ Please enter both username and password")
-            else:
-                with st.spinner("🔍 Verifying credentials..."):
-                    user_data = verify_credentials(username, password)
-
-                    if user_data:
-                        # Check if user is active
-                        if user_data.get("status", "Active").lower() != "active":
-                            st.error(
-                                "❌ Your account has been deactivated. Contact admin."
-                            )
-                            log_login_activity(username, "Failed - Deactivated")
-                        else:
-                            # Successful login
-                            st.session_state.logged_in = True
-                            st.session_state.username = user_data["username"]
-                            st.session_state.role = user_data["role"]
-                            st.session_state.full_name = user_data["full_name"]
-                            st.session_state.email = user_data["email"]
-
-                            # Log activity
-                            log_login_activity(username, "Success")
-
-                            st.success(f"✅ Welcome, {user_data['full_name']}!")
-                            st.balloons()
-
-                            # Clear form
-                            st.session_state.login_username = ""
-                            st.session_state.login_password = ""
-
-                            st.rerun()
-                    else:
-                        st.error("❌ Invalid username or password")
-                        log_login_activity(username, "Failed - Invalid Credentials")
-
-    # Footer
-    st.markdown("---")
-    st.markdown(
-        """
-        <div style='text-align: center; color: gray; font-size: 12px;'>
-            <p>📧 Need help? Contact: admin@placementagency.com</p>
-            <p>© 2025 Placement Agency. All rights reserved.</p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-
-# =======================================================
-# CHANGE PASSWORD UI
-# =======================================================
-def render_change_password():
-    """Render change password interface"""
-    st.subheader("🔒 Change Password")
-
-    with st.form("change_password_form"):
-        st.info(f"Changing password for: **{st.session_state.username}**")
-
-        current_password = st.text_input("Current Password", type="password")
-        new_password = st.text_input("New Password", type="password")
-        confirm_password = st.text_input("Confirm New Password", type="password")
-
-        submitted = st.form_submit_button("Update Password")
-
-        if submitted:
-            # Verify current password
-            user_data = verify_credentials(st.session_state.username, current_password)
-
-            if not user_data:
-                st.error("❌ Current password is incorrect")
-            elif len(new_password) < 6:
-                st.error("❌ New password must be at least 6 characters")
-            elif new_password != confirm_password:
-                st.error("❌ New passwords do not match")
-            else:
-                if change_password(st.session_state.username, new_password):
-                    st.success("✅ Password changed successfully!")
-                    log_login_activity(st.session_state.username, "Password Changed")
-                else:
-                    st.error("❌ Error changing password")
-
-
-# =======================================================
-# USER MANAGEMENT UI (Admin Only)
-# =======================================================
-def render_user_management():
-    """Render user management interface (Admin only)"""
-
-    if st.session_state.get("role", "").upper() != "ADMIN":
-        st.error("❌ Access Denied: Admin privileges required")
-        return
-
-    st.subheader("👥 User Management")
-
-    tab1, tab2, tab3 = st.tabs(["View Users", "Add User", "Login Logs"])
-
-    with tab1:
-        st.markdown("### 📋 All Users")
-        df = get_users_from_sheet()
-
-        if df is not None and not df.empty:
-            # Hide password column
-            display_df = df.drop(columns=["Password"], errors="ignore")
-            st.dataframe(display_df, use_container_width=True)
-        else:
-            st.info("No users found")
-
-    with tab2:
-        st.markdown("### ➕ Add New User")
-
-        with st.form("add_user_form"):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                new_username = st.text_input(
-                    "Username *", placeholder="e.g., john.doe"
-                )
-                new_password = st.text_input(
-                    "Password *", type="password", placeholder="Min 6 characters"
-                )
-                role = st.selectbox("Role *", ["ADMIN", "RECRUITER", "VIEWER"])
-
-            with col2:
-                full_name = st.text_input(
-                    "Full Name *", placeholder="e.g., John Doe"
-                )
-                email = st.text_input("Email", placeholder="user@example.com")
-
-            submitted = st.form_submit_button("Add User")
-
-            if submitted:
-                if not new_username or not new_password or not full_name:
-                    st.error("❌ Please fill all required fields")
-                elif len(new_password) < 6:
-                    st.error("❌ Password must be at least 6 characters")
-                else:
-                    if add_new_user(
-                        new_username, new_password, role, full_name, email
-                    ):
-                        st.success(
-                            f"✅ User '{new_username}' added successfully!"
-                        )
-                        log_login_activity(
-                            st.session_state.username,
-                            f"Added user: {new_username}",
-                        )
-                        st.rerun()
-
-    with tab3:
-        st.markdown("### 📊 Login Activity Logs")
-        try:
-            client = get_google_sheets_client()
-            if client:
-                sheet = client.open_by_key(SHEET_ID).worksheet("Login_Logs")
-                logs_df = pd.DataFrame(sheet.get_all_records())
-
-                if not logs_df.empty:
-                    # Show last 50 logs
-                    st.dataframe(
-                        logs_df.tail(50).sort_values(
-                            "Timestamp", ascending=False
-                        ),
-                        use_container_width=True,
-                    )
-                else:
-                    st.info("No login logs yet")
-        except Exception as e:
-            st.error(f"Error loading logs: {str(e)}")
-
-
-# =======================================================
-# LOGOUT FUNCTION
-# =======================================================
-def logout():
-    """Logout user and clear session"""
-    username = st.session_state.get("username", "Unknown")
-    log_login_activity(username, "Logout")
-
-    # Clear all session state
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
-
-    st.rerun()
-
-
-# =======================================================
-# DIRECT RUN (for testing)
-# =======================================================
-if __name__ == "__main__":
-    render_login()
+import streamlit as st
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import groupby
+import pandas as pd
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import absolute_range_name
+from sheets_connector import (
+    get_client, get_spreadsheet, get_worksheet, get_sheet_frame, sheet_version,
+    invalidate_sheet, locate_row, append_row, append_rows, update_cell,
+)
+from write_queue import DONE, FAILED, last_pending_job, submit_append, wait_for
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------------------------------
+# PAGE CONFIG (top-level)
+# -------------------------------------------------------
+#st.set_page_config(
+   # page_title="Placement Agency - Login",
+   # page_icon="🔐",
+    #layout="centered",
+    #initial_sidebar_state="collapsed"
+#)
+
+# =======================================================
+# GOOGLE SHEETS CONFIG FOR LOGIN
+# =======================================================
+# Shared client + cached worksheet handles live in sheets_connector
+
+
+# =======================================================
+# USER AUTHENTICATION FUNCTIONS
+# =======================================================
+def get_users_from_sheet():
+    """Fetch all users from Google Sheets 'Users' tab"""
+    try:
+        if not get_client():
+            return None
+
+        # Served from the shared snapshot (one batch read for all tabs)
+        df = get_sheet_frame("Users")
+
+        if df.empty:
+            return None
+
+        return df
+
+    except Exception as e:
+        st.error(f"Error fetching users: {str(e)}")
+        return None
+
+
+# =======================================================
+# USER INDEX (username → user record)
+# =======================================================
+# Logins look a user up by name instead of filtering the whole Users
+# DataFrame. The index is rebuilt when the cached Users tab changes, after
+# USER_INDEX_TTL seconds, or after invalidate_user_index().
+USER_INDEX_TTL = 300
+
+_user_index_lock = threading.Lock()
+_user_index = {"users": None, "loaded": 0.0, "version": None}
+
+
+def invalidate_user_index():
+    """Rebuild the username index on next lookup"""
+    with _user_index_lock:
+        _user_index["users"] = None
+
+
+def get_user_index():
+    """{username (lowercase): user record dict} or None"""
+    with _user_index_lock:
+        try:
+            version = sheet_version("Users")
+        except Exception:
+            version = None
+        if (
+            _user_index["users"] is None
+            or _user_index["version"] != version
+            or time.monotonic() - _user_index["loaded"] > USER_INDEX_TTL
+        ):
+            df = get_users_from_sheet()
+            if df is None or "Username" not in df.columns:
+                return None
+            users = {}
+            for record in df.to_dict("records"):
+                key = str(record["Username"]).strip().lower()
+                if key and key not in users:
+                    users[key] = record  # first row wins, like the old filter
+            _user_index.update(users=users, loaded=time.monotonic(), version=version)
+        return _user_index["users"]
+
+
+def find_user(username):
+    """User record (dict) by username, case-insensitive; None if not found"""
+    users = get_user_index()
+    if not users:
+        return None
+    return users.get(str(username).strip().lower())
+
+
+def verify_credentials(username, password):
+    """Verify username and password against Google Sheets"""
+    if not get_user_index():
+        st.error("❌ Unable to fetch user data from Google Sheets")
+        return None
+
+    # Lookup user
+    user = find_user(username)
+
+    if user is None:
+        return None
+
+    # Get stored password hash
+    stored_hash = user['Password']
+
+    # Hash input password
+    input_hash = hashlib.sha256(password.encode()).hexdigest()
+
+    # Verify password
+    if stored_hash == input_hash:
+        return {
+            'username': user['Username'],
+            'role': user['Role'],
+            'full_name': user.get('Full Name', username),
+            'email': user.get('Email', ''),
+            'status': user.get('Status', 'Active'),
+            'permissions': user_permissions(user)
+        }
+
+    return None
+
+
+# =======================================================
+# PERMISSION CACHE (per session)
+# =======================================================
+# Permission flags (every Users column that is not a profile field) are
+# loaded at login and kept in st.session_state, so require_permission()
+# costs no API call per rerun. They are reloaded after PERMISSION_TTL
+# seconds or after invalidate_permissions() (e.g. admin changed access).
+PERMISSION_TTL = 300
+PERMISSION_TRUE = ["yes", "1", "true", "y"]
+USER_FIELDS = ["Username", "Password", "Role", "Full Name", "Email", "Status", "Created Date"]
+
+# Bumped by invalidate_permissions(); "*" = every user (shared by all sessions)
+_permission_epochs = {}
+
+
+def user_permissions(user_row):
+    """{flag column: True/False} from one Users row"""
+    return {
+        col: str(value).strip().lower() in PERMISSION_TRUE
+        for col, value in user_row.items()
+        if col not in USER_FIELDS
+    }
+
+
+def _permission_epoch(username):
+    return (_permission_epochs.get("*", 0), _permission_epochs.get(str(username).lower(), 0))
+
+
+def store_permissions(username, permissions):
+    """Keep the user's permission flags in the session"""
+    st.session_state.permissions = {
+        "username": username,
+        "flags": permissions,
+        "loaded": time.monotonic(),
+        "epoch": _permission_epoch(username),
+    }
+
+
+def invalidate_permissions(username=None):
+    """Force every session (or one user's) to reload permissions on next check"""
+    key = "*" if username is None else str(username).lower()
+    _permission_epochs[key] = _permission_epochs.get(key, 0) + 1
+    invalidate_sheet("Users")
+    invalidate_user_index()
+
+
+def load_permissions(username):
+    """
+    Read the user's flags from the Users sheet into the session (flags
+    None = no such user). Raises if the Users sheet cannot be read -
+    nothing is cached then, the next check tries again.
+    """
+    if get_user_index() is None:
+        raise RuntimeError("Unable to fetch user data from Google Sheets")
+    user = find_user(username)
+    store_permissions(username, user_permissions(user) if user else None)
+    return st.session_state.permissions
+
+
+def has_permission(flag_column):
+    """
+    Cached permission flag of the logged-in user.
+    Returns False for an unknown user, None if the Users sheet has no such
+    column.
+    """
+    username = st.session_state.get("username", "")
+    cache = st.session_state.get("permissions")
+    if cache is not None and cache["username"] != username:
+        cache = None
+    if (
+        cache is None
+        or time.monotonic() - cache["loaded"] > PERMISSION_TTL
+        or cache["epoch"] != _permission_epoch(username)
+    ):
+        try:
+            cache = load_permissions(username)
+        except Exception as e:
+            # Expired (not revoked) flags beat locking the user out on a 429
+            if cache is None or cache["epoch"] != _permission_epoch(username):
+                raise
+            logger.warning(f"Permission reload failed, using cached flags: {e}")
+    if cache["flags"] is None:
+        return False
+    return cache["flags"].get(flag_column)
+
+
+# =======================================================
+# LOGIN LOG BUFFER (batched writes to Login_Logs)
+# =======================================================
+# Login events go into an in-memory buffer; a background thread hands
+# them to the write queue as ONE append_rows job every LOG_FLUSH_SECONDS
+# or as soon as LOG_BATCH_SIZE events are waiting. The buffer is bounded
+# (oldest events dropped first) and flushed once more at shutdown.
+# If the hand-off fails the events stay buffered and the writer backs off
+# (LOG_FLUSH_SECONDS doubling up to LOG_RETRY_MAX) before trying again.
+LOG_BATCH_SIZE = 25
+LOG_FLUSH_SECONDS = 5
+LOG_RETRY_MAX = 300
+LOG_BUFFER_MAX = 1000
+
+_log_buffer = deque()
+_log_cond = threading.Condition()
+_log_thread = None
+_log_dropped = 0
+_log_failures = 0
+_log_retry_at = 0.0
+
+
+def log_login_activity(username, status, ip_address="N/A"):
+    """Log login attempts to Google Sheets 'Login_Logs' tab (buffered)"""
+    global _log_dropped
+    try:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        row = [timestamp, username, status, ip_address]
+        with _log_cond:
+            if len(_log_buffer) >= LOG_BUFFER_MAX:
+                _log_buffer.popleft()
+                _log_dropped += 1
+                if _log_dropped == 1:
+                    logger.warning(
+                        f"Login log buffer full ({LOG_BUFFER_MAX}) - dropping oldest events"
+                    )
+            _log_buffer.append(row)
+            if len(_log_buffer) >= LOG_BATCH_SIZE:
+                _log_cond.notify()
+        _start_log_writer()
+
+        return True
+    except Exception as e:
+        print(f"Error logging activity: {str(e)}")
+        return False
+
+
+def flush_login_logs():
+    """Hand every buffered event to the write queue (one append job)"""
+    global _log_dropped, _log_failures, _log_retry_at
+    with _log_cond:
+        rows = list(_log_buffer)
+        _log_buffer.clear()
+        dropped, _log_dropped = _log_dropped, 0
+    if dropped:
+        logger.warning(f"Login log buffer full - {dropped} oldest events dropped")
+    if not rows:
+        return 0
+    try:
+        submit_append("Login_Logs", rows)
+    except Exception as e:
+        # Keep them for the next round (still bounded)
+        with _log_cond:
+            _log_buffer.extendleft(reversed(rows))
+            while len(_log_buffer) > LOG_BUFFER_MAX:
+                _log_buffer.popleft()
+                _log_dropped += 1
+            _log_failures += 1
+            delay = min(LOG_RETRY_MAX, LOG_FLUSH_SECONDS * 2 ** (_log_failures - 1))
+            _log_retry_at = time.monotonic() + delay
+            dropped = _log_dropped
+        logger.warning(
+            f"Could not queue {len(rows)} login log events, retrying in {delay}s"
+            f"{f' ({dropped} dropped, buffer full)' if dropped else ''}: {e}"
+        )
+        return 0
+    with _log_cond:
+        _log_failures = 0
+        _log_retry_at = 0.0
+    return len(rows)
+
+
+def _log_writer_loop():
+    while True:
+        with _log_cond:
+            backoff = _log_retry_at - time.monotonic()
+            if backoff > 0:
+                _log_cond.wait(backoff)
+                continue
+            if len(_log_buffer) < LOG_BATCH_SIZE:
+                _log_cond.wait(LOG_FLUSH_SECONDS)
+        flush_login_logs()
+
+
+def _start_log_writer():
+    global _log_thread
+    with _log_cond:
+        if _log_thread is not None:
+            return
+        _log_thread = threading.Thread(
+            target=_log_writer_loop, name="login-log-writer", daemon=True
+        )
+        _log_thread.start()
+    atexit.register(flush_login_logs)
+
+
+# =======================================================
+# LOGIN LOG VIEWER (tail reads + archival)
+# =======================================================
+# Login_Logs only grows, so the viewer never downloads it whole:
+# - the last data row comes from the grid size (sheet metadata), stepping
+#   back over blank grid rows
+# - rows are appended in time order, so a date filter is a k-ary search
+#   on the Timestamp column (LOG_PROBES single cells per batch read)
+# - a page is one range read; the username filter scans back from the
+#   newest row in LOG_SCAN_CHUNK pages, at most LOG_MAX_SCAN_ROWS rows
+# archive_login_logs() moves old rows into monthly archive worksheets
+# (Login_Logs_YYYY-MM) so the live tab stays small.
+LOG_SHEET = "Login_Logs"
+LOG_HEADERS = ["Timestamp", "Username", "Status", "IP Address"]
+LOG_LAST_COL = "D"
+LOG_PROBES = 16
+LOG_SCAN_CHUNK = 1000
+LOG_MAX_SCAN_ROWS = 20000
+LOG_ARCHIVE_WAIT = 60
+
+
+def _log_range(first, last, last_col=LOG_LAST_COL):
+    return absolute_range_name(LOG_SHEET, f"A{first}:{last_col}{last}")
+
+
+def _read_log_rows(spreadsheet, first, last):
+    """Rows first..last of Login_Logs, padded to LOG_HEADERS"""
+    if last < first:
+        return []
+    values = spreadsheet.values_get(_log_range(first, last)).get("values", [])
+    width = len(LOG_HEADERS)
+    return [
+        (row + [""] * width)[:width]
+        for row in values + [[]] * (last - first + 1 - len(values))
+    ]
+
+
+def _log_end_row(spreadsheet):
+    """Last data row of Login_Logs (1 = header only)"""
+    meta = spreadsheet.fetch_sheet_metadata()
+    end = next(
+        (sheet["properties"]["gridProperties"]["rowCount"]
+         for sheet in meta.get("sheets", [])
+         if sheet["properties"]["title"] == LOG_SHEET),
+        1
+    )
+    while end > 1:
+        start = max(2, end - LOG_SCAN_CHUNK + 1)
+        values = spreadsheet.values_get(
+            _log_range(start, end, "A")
+        ).get("values", [])
+        if values:
+            return start + len(values) - 1
+        end = start - 1
+    return 1
+
+
+def _first_row_at(spreadsheet, timestamp, lo, hi):
+    """First row in lo..hi with Timestamp >= timestamp (hi + 1 if none)"""
+    while hi - lo + 1 > LOG_PROBES:
+        step = (hi - lo + 1) / LOG_PROBES
+        rows = sorted({lo + int(i * step) for i in range(LOG_PROBES)})
+        response = spreadsheet.values_batch_get(
+            [absolute_range_name(LOG_SHEET, f"A{row}") for row in rows]
+        )
+        new_lo, new_hi = lo, hi
+        for row, value_range in zip(rows, response.get("valueRanges", [])):
+            values = value_range.get("values") or [[""]]
+            if str(values[0][0] if values[0] else "") < timestamp:
+                new_lo = row + 1
+            else:
+                new_hi = row
+                break
+        lo, hi = new_lo, new_hi
+
+    for offset, row in enumerate(_read_log_rows(spreadsheet, lo, hi)):
+        if str(row[0]) >= timestamp:
+            return lo + offset
+    return hi + 1
+
+
+def read_login_logs(username="", date_from=None, date_to=None, page=0, page_size=50):
+    """
+    One page of Login_Logs, newest first, filtered by username (contains,
+    case-insensitive) and date range (inclusive dates).
+    Returns (DataFrame, total rows or None if not fully counted, more pages?)
+    """
+    spreadsheet = get_spreadsheet()
+    end = _log_end_row(spreadsheet)
+    lo, hi = 2, end
+    if end >= 2 and date_from:
+        lo = _first_row_at(spreadsheet, f"{date_from} 00:00:00", 2, end)
+    if end >= 2 and date_to:
+        day_after = f"{date_to + timedelta(days=1)} 00:00:00"
+        hi = _first_row_at(spreadsheet, day_after, lo, end) - 1
+
+    if hi < lo:
+        return pd.DataFrame(columns=LOG_HEADERS), 0, False
+
+    if not username:
+        total = hi - lo + 1
+        last = hi - page * page_size
+        first = max(lo, last - page_size + 1)
+        rows = _read_log_rows(spreadsheet, first, last)[::-1]
+        return pd.DataFrame(rows, columns=LOG_HEADERS), total, first > lo
+
+    needle = username.strip().lower()
+    wanted = (page + 1) * page_size
+    matches = []
+    cursor = hi
+    while cursor >= lo and len(matches) <= wanted and hi - cursor < LOG_MAX_SCAN_ROWS:
+        first = max(lo, cursor - LOG_SCAN_CHUNK + 1)
+        for row in reversed(_read_log_rows(spreadsheet, first, cursor)):
+            if needle in str(row[1]).lower():
+                matches.append(row)
+        cursor = first - 1
+
+    rows = matches[page * page_size:wanted]
+    complete = cursor < lo
+    more = len(matches) > wanted or not complete
+    return (
+        pd.DataFrame(rows, columns=LOG_HEADERS),
+        len(matches) if complete else None,
+        more,
+    )
+
+
+def archive_login_logs(keep_days=90):
+    """
+    Move Login_Logs rows older than keep_days into monthly archive
+    worksheets. Returns the number of rows moved.
+    """
+    # Row numbers are only stable once every buffered/queued event is in
+    # the sheet - flush and wait for the write queue before cutting
+    flush_login_logs()
+    if _log_buffer:
+        raise RuntimeError("Login log events could not be queued - try again later")
+    job_id = last_pending_job(LOG_SHEET)
+    if job_id is not None:
+        job = wait_for(job_id, LOG_ARCHIVE_WAIT)
+        if job is not None and job["status"] not in (DONE, FAILED):
+            raise RuntimeError("Login log writes are still queued - try again later")
+
+    spreadsheet = get_spreadsheet()
+    end = _log_end_row(spreadsheet)
+    if end < 2:
+        return 0
+    cutoff = (datetime.now() - timedelta(days=keep_days)).strftime("%Y-%m-%d 00:00:00")
+    cut = _first_row_at(spreadsheet, cutoff, 2, end)
+    if cut <= 2:
+        return 0
+
+    old_rows = _read_log_rows(spreadsheet, 2, cut - 1)
+
+    def _month(row):
+        return str(row[0])[:7] if str(row[0])[:4].isdigit() else "undated"
+
+    # One month (run of rows) at a time: copy, then delete it from the top
+    # of Login_Logs - a failure part-way never loses rows, and a re-run
+    # does not copy the finished months again
+    log_sheet = get_worksheet(LOG_SHEET)
+    # Cached row numbers are wrong from the moment rows start to shift
+    invalidate_sheet(LOG_SHEET)
+    try:
+        for month, run in groupby(old_rows, key=_month):
+            rows = list(run)
+            title = f"{LOG_SHEET}_{month}"
+            try:
+                # Empty if an earlier run created the tab but its append failed
+                has_header = bool(get_worksheet(title).row_values(1))
+            except WorksheetNotFound:
+                spreadsheet.add_worksheet(title, rows=len(rows) + 1, cols=len(LOG_HEADERS))
+                has_header = False
+            append_rows(title, rows if has_header else [LOG_HEADERS] + rows)
+            log_sheet.delete_rows(2, len(rows) + 1)
+    finally:
+        invalidate_sheet(LOG_SHEET)
+    logger.info(f"Archived {len(old_rows)} login log rows")
+    return len(old_rows)
+
+
+# =======================================================
+# USER MANAGEMENT FUNCTIONS (Admin Only)
+# =======================================================
+def add_new_user(username, password, role, full_name, email):
+    """Add new user to Google Sheets (Admin function)"""
+    try:
+        if not get_client():
+            return False
+
+        # Check if username already exists
+        if find_user(username) is not None:
+            st.error(f"❌ Username '{username}' already exists!")
+            return False
+
+        # Hash password
+        password_hash = hashlib.sha256(password.encode()).hexdigest()
+
+        # Create user row
+        created_date = datetime.now().strftime("%Y-%m-%d")
+        row = [username, password_hash, role, full_name, email, "Active", created_date]
+
+        append_row("Users", row)  # cached Users tab is patched too
+        invalidate_user_index()
+        return True
+
+    except Exception as e:
+        st.error(f"Error adding user: {str(e)}")
+        return False
+
+
+def change_password(username, new_password):
+    """Change user password"""
+    try:
+        if not get_client():
+            return False
+
+        # Find user row (index lookup, verified against the live sheet row)
+        user = find_user(username)
+        if user is None:
+            return False
+        row_num, _ = locate_row("Users", ("Username",), user["Username"])
+
+        if row_num is None:
+            return False
+
+        new_hash = hashlib.sha256(new_password.encode()).hexdigest()
+
+        update_cell("Users", row_num, 2, new_hash)  # Column 2 = Password
+        invalidate_user_index()
+        return True
+
+    except Exception as e:
+        st.error(f"Error changing password: {str(e)}")
+        return False
+
+
+# =======================================================
+# LOGIN UI
+# =======================================================
+def render_login():
+    """Render stable login page with Google Sheets authentication"""
+
+    # Custom CSS
+    st.markdown(
+        """
+        <style>
+        /* Prevent layout shift */
+        .stTextInput > div > div > input {
+            transition: none !important;
+        }
+
+        .stTextInput {
+            min-height: 70px;
+        }
+
+        /* Center content */
+        .main .block-container {
+            max-width: 500px;
+            padding-top: 3rem;
+        }
+
+        /* Remove Streamlit branding */
+        #MainMenu {visibility: hidden;}
+        footer {visibility: hidden;}
+
+        /* Custom header */
+        .login-header {
+            text-align: center;
+            padding: 2rem 0;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            border-radius: 10px;
+            color: white;
+            margin-bottom: 2rem;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # Header
+    st.markdown(
+        """
+        <div class="login-header">
+            <h1>🔐 Placement Agency</h1>
+            <p>Management System Login</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # Initialize session state
+    if "login_username" not in st.session_state:
+        st.session_state.login_username = ""
+    if "login_password" not in st.session_state:
+        st.session_state.login_password = ""
+
+    # Login form
+    with st.form("login_form", clear_on_submit=False):
+        st.markdown("### 🔑 Enter Your Credentials")
+
+        username = st.text_input(
+            "Username",
+            value=st.session_state.login_username,
+            key="username_input",
+            placeholder="Enter your username",
+            autocomplete="username",
+        )
+
+        password = st.text_input(
+            "Password",
+            value=st.session_state.login_password,
+            type="password",
+            key="password_input",
+            placeholder="Enter your password",
+            autocomplete="current-password",
+        )
+
+        # Remember me checkbox (abhi use nahi kar rahe)
+        remember_me = st.checkbox("Remember me", value=False)
+
+        # Login button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            submitted = st.form_submit_button("🔓 Login", use_container_width=True)
+
+        # Process login
+        if submitted:
+            if not username or not password:
+                st.error("❌ Please enter both username and password")
+            else:
+                with st.spinner("🔍 Verifying credentials..."):
+                    user_data = verify_credentials(username, password)
+
+                    if user_data:
+                        # Check if user is active
+                        if user_data.get("status", "Active").lower() != "active":
+                            st.error(
+                                "❌ Your account has been deactivated. Contact admin."
+                            )
+                            log_login_activity(username, "Failed - Deactivated")
+                        else:
+                            # Successful login
+                            st.session_state.logged_in = True
+                            st.session_state.username = user_data["username"]
+                            st.session_state.role = user_data["role"]
+                            st.session_state.full_name = user_data["full_name"]
+                            st.session_state.email = user_data["email"]
+                            store_permissions(user_data["username"], user_data["permissions"])
+
+                            # Log activity
+                            log_login_activity(username, "Success")
+
+                            st.success(f"✅ Welcome, {user_data['full_name']}!")
+                            st.balloons()
+
+                            # Clear form
+                            st.session_state.login_username = ""
+                            st.session_state.login_password = ""
+
+                            st.rerun()
+                    else:
+                        st.error("❌ Invalid username or password")
+                        log_login_activity(username, "Failed - Invalid Credentials")
+
+    # Footer
+    st.markdown("---")
+    st.markdown(
+        """
+        <div style='text-align: center; color: gray; font-size: 12px;'>
+            <p>📧 Need help? Contact: admin@placementagency.com</p>
+            <p>© 2025 Placement Agency. All rights reserved.</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+# =======================================================
+# CHANGE PASSWORD UI
+# =======================================================
+def render_change_password():
+    """Render change password interface"""
+    st.subheader("🔒 Change Password")
+
+    with st.form("change_password_form"):
+        st.info(f"Changing password for: **{st.session_state.username}**")
+
+        current_password = st.text_input("Current Password", type="password")
+        new_password = st.text_input("New Password", type="password")
+        confirm_password = st.text_input("Confirm New Password", type="password")
+
+        submitted = st.form_submit_button("Update Password")
+
+        if submitted:
+            # Verify current password
+            user_data = verify_credentials(st.session_state.username, current_password)
+
+            if not user_data:
+                st.error("❌ Current password is incorrect")
+            elif len(new_password) < 6:
+                st.error("❌ New password must be at least 6 characters")
+            elif new_password != confirm_password:
+                st.error("❌ New passwords do not match")
+            else:
+                if change_password(st.session_state.username, new_password):
+                    st.success("✅ Password changed successfully!")
+                    log_login_activity(st.session_state.username, "Password Changed")
+                else:
+                    st.error("❌ Error changing password")
+
+
+# =======================================================
+# USER MANAGEMENT UI (Admin Only)
+# =======================================================
+def render_user_management():
+    """Render user management interface (Admin only)"""
+
+    if st.session_state.get("role", "").upper() != "ADMIN":
+        st.error("❌ Access Denied: Admin privileges required")
+        return
+
+    st.subheader("👥 User Management")
+
+    tab1, tab2, tab3 = st.tabs(["View Users", "Add User", "Login Logs"])
+
+    with tab1:
+        st.markdown("### 📋 All Users")
+        df = get_users_from_sheet()
+
+        if df is not None and not df.empty:
+            # Hide password column
+            display_df = df.drop(columns=["Password"], errors="ignore")
+            st.dataframe(display_df, use_container_width=True)
+        else:
+            st.info("No users found")
+
+        # Access changed directly in the Users sheet → apply it now
+        if st.button("🔄 Reload Users & Permissions"):
+            invalidate_permissions()
+            st.rerun()
+
+    with tab2:
+        st.markdown("### ➕ Add New User")
+
+        with st.form("add_user_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                new_username = st.text_input(
+                    "Username *", placeholder="e.g., john.doe"
+                )
+                new_password = st.text_input(
+                    "Password *", type="password", placeholder="Min 6 characters"
+                )
+                role = st.selectbox("Role *", ["ADMIN", "RECRUITER", "VIEWER"])
+
+            with col2:
+                full_name = st.text_input(
+                    "Full Name *", placeholder="e.g., John Doe"
+                )
+                email = st.text_input("Email", placeholder="user@example.com")
+
+            submitted = st.form_submit_button("Add User")
+
+            if submitted:
+                if not new_username or not new_password or not full_name:
+                    st.error("❌ Please fill all required fields")
+                elif len(new_password) < 6:
+                    st.error("❌ Password must be at least 6 characters")
+                else:
+                    if add_new_user(
+                        new_username, new_password, role, full_name, email
+                    ):
+                        st.success(
+                            f"✅ User '{new_username}' added successfully!"
+                        )
+                        log_login_activity(
+                            st.session_state.username,
+                            f"Added user: {new_username}",
+                        )
+                        st.rerun()
+
+    with tab3:
+        st.markdown("### 📊 Login Activity Logs")
+        f1, f2, f3 = st.columns([2, 2, 1])
+        with f1:
+            log_user = st.text_input("Username contains", key="log_user")
+        with f2:
+            log_dates = st.date_input("Date range", value=(), key="log_dates")
+        with f3:
+            log_page_size = st.selectbox("Rows", [25, 50, 100, 200], index=1, key="log_page_size")
+        log_page = st.number_input("Page", min_value=1, value=1, step=1, key="log_page")
+
+        date_from = log_dates[0] if len(log_dates) > 0 else None
+        date_to = log_dates[1] if len(log_dates) > 1 else date_from
+        try:
+            if get_client():
+                logs_df, total, more = read_login_logs(
+                    log_user, date_from, date_to, int(log_page) - 1, log_page_size
+                )
+
+                if not logs_df.empty:
+                    st.dataframe(logs_df, use_container_width=True)
+                    found = f"{total} matching rows" if total is not None else "more matches available"
+                    st.caption(f"Page {int(log_page)} · {found}" + (" · next page ➡️" if more else ""))
+                else:
+                    st.info("No login logs for these filters")
+        except Exception as e:
+            st.error(f"Error loading logs: {str(e)}")
+
+        with st.expander("🗄️ Archive old logs"):
+            keep_days = st.number_input("Keep last N days", min_value=1, value=90, step=1, key="log_keep_days")
+            st.caption("Old rows move to monthly worksheets (Login_Logs_YYYY-MM)")
+            if st.button("Archive", key="log_archive"):
+                try:
+                    moved = archive_login_logs(int(keep_days))
+                    st.success(f"✅ Archived {moved} log rows")
+                except Exception as e:
+                    st.error(f"Error archiving logs: {str(e)}")
+
+# =======================================================
+# LOGOUT FUNCTION
+# =======================================================
+def logout():
+    """Logout user and clear session"""
+    username = st.session_state.get("username", "Unknown")
+    log_login_activity(username, "Logout")
+
+    # Clear all session state
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+    st.rerun()
+
+
+# =======================================================
+# DIRECT RUN (for testing)
+# =======================================================
+if __name__ == "__main__":
+    render_login()
@@ -1,126 +1,974 @@
-import gspread
-from google.oauth2.service_account import Credentials
-import pandas as pd
-import streamlit as st
-
-
-# Google Sheets authentication
-SCOPE = [
-    'https://www.googleapis.com/auth/spreadsheets',
-    'https://www.googleapis.com/auth/drive'
-]
-
-
-@st.cache_resource
-def authenticate_google_sheets():
-    """
-    Authenticate with Google Sheets API
-    Uses st.secrets for credentials (Streamlit Cloud)
-    """
-    try:
-        creds = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=SCOPE
-        )
-        client = gspread.authorize(creds)
-        return client
-    except Exception as e:
-        st.error(f"Authentication failed: {str(e)}")
-        st.info("Please add gcp_service_account to Streamlit Secrets")
-        return None
-
-
-@st.cache_data(ttl=300)
-def fetch_candidates_data(sheet_url, sheet_name="Candidates"):
-    """
-    Fetch all candidates data from Google Sheet
-    TTL = 5 minutes (cache refresh)
-    """
-    try:
-        client = authenticate_google_sheets()
-        if client is None:
-            return None
-        
-        # Open spreadsheet by URL
-        spreadsheet = client.open_by_url(sheet_url)
-        worksheet = spreadsheet.worksheet(sheet_name)
-        
-        # Get all data
-        data = worksheet.get_all_values()
-        
-        if len(data) <= 1:
-            return None
-        
-        # Convert to DataFrame
-        headers = data[0]
-        rows = data[1:]
-        df = pd.DataFrame(rows, columns=headers)
-        
-        return df
-    except Exception as e:
-        st.error(f"Error fetching data: {str(e)}")
-        return None
-
-
-@st.cache_data(ttl=300)
-def fetch_companies_data(sheet_url, sheet_name="Sheet4"):
-    """
-    Fetch all companies data from Google Sheet (Sheet4)
-    TTL = 5 minutes (cache refresh)
-    """
-    try:
-        client = authenticate_google_sheets()
-        if client is None:
-            return None
-        
-        # Open spreadsheet by URL
-        spreadsheet = client.open_by_url(sheet_url)
-        worksheet = spreadsheet.worksheet(sheet_name)
-        
-        # Get all data
-        data = worksheet.get_all_values()
-        
-        if len(data) <= 1:
-            return None
-        
-        # Convert to DataFrame
-        headers = data[0]
-        rows = data[1:]
-        df = pd.DataFrame(rows, columns=headers)
-        
-        return df
-    except Exception as e:
-        st.error(f"Error fetching companies data: {str(e)}")
-        return None
-
-
-def get_column_headers(df):
-    """Get all column headers from DataFrame"""
-    if df is None:
-        return []
-    return list(df.columns)
-
-
-def get_unique_values(df, column):
-    """
-    Get unique values from specific column
-    Remove empty values
-    """
-    if df is None or column not in df.columns:
-        return []
-    
-    values = df[column].unique().tolist()
-    values = [v for v in values if v and str(v).strip()]  # Remove empty
-    return sorted(values)
-
-
-def apply_filter(df, column, value):
-    """
-    Apply single filter to DataFrame
-    Returns filtered DataFrame
-    """
-    if df is None or column not in df.columns:
-        return df
-    
-    filtered = df[df[column] == value]
-    return filtered
+import itertools
+import logging
+from collections import Counter
+import os
+import threading
+import time
+
+import gspread
+from gspread.utils import (
+    a1_to_rowcol,
+    absolute_range_name,
+    extract_id_from_url,
+    fill_gaps,
+    numericise_all,
+    rowcol_to_a1,
+)
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+import pandas as pd
+import streamlit as st
+
+import sheets_mirror
+from fake_sheets import FakeClient
+from sheets_limiter import LimitedClient, single_flight
+
+logger = logging.getLogger(__name__)
+
+
+# Google Sheets authentication
+SCOPE = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+SHEET_ID = "1rpuXdpfwjy0BQcaZcn0Acbh-Se6L3PvyNGiNu4NLcPA"
+CRED_FILE = "credentials.json"
+
+# Keep-alive connections shared by all sessions/threads of the app
+HTTP_POOL_SIZE = 16
+
+
+# ====================================================
+# SHARED CONNECTION (one client, cached handles)
+# ====================================================
+# Every module reads/writes Google Sheets through these helpers:
+#   get_client()      – authenticated once per process
+#   get_spreadsheet() – Spreadsheet handle cached per sheet id
+#   get_worksheet()   – Worksheet handle cached per (sheet id, title)
+# Opening a spreadsheet / worksheet costs metadata round-trips, so the
+# handles are reused instead of calling open_by_key() on every read.
+
+_lock = threading.RLock()
+_client = None
+_backend_override = False
+_spreadsheets = {}
+_worksheets = {}
+
+
+def _load_credentials():
+    """credentials.json for local development, st.secrets on Streamlit Cloud."""
+    if os.path.exists(CRED_FILE):
+        return Credentials.from_service_account_file(CRED_FILE, scopes=SCOPE)
+    return Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=SCOPE
+    )
+
+
+def get_client():
+    """
+    Authenticated gspread client shared by the whole process (or the
+    stand-in set by set_backend / SHEETS_FAKE_DATA).
+    Returns None if authentication fails.
+    """
+    global _client, _backend_override
+    with _lock:
+        if _client is None and os.environ.get("SHEETS_FAKE_DATA"):
+            _client = FakeClient(path=os.environ["SHEETS_FAKE_DATA"])
+            _backend_override = True
+        if _client is None:
+            try:
+                # Every request passes the process-wide rate limiter
+                client = gspread.authorize(
+                    _load_credentials(), client_factory=LimitedClient
+                )
+                # Bigger keep-alive pool: Streamlit serves sessions on threads
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE
+                )
+                client.session.mount("https://", adapter)
+                _client = client
+            except Exception as e:
+                logger.error(f"Google Sheets authentication failed: {e}")
+                return None
+        return _client
+
+
+def get_spreadsheet(sheet_id=SHEET_ID):
+    """Cached Spreadsheet handle (raises if Sheets is unreachable)."""
+    with _lock:
+        spreadsheet = _spreadsheets.get(sheet_id)
+        if spreadsheet is None:
+            client = get_client()
+            if client is None:
+                raise RuntimeError("Google Sheets client not available")
+            spreadsheet = client.open_by_key(sheet_id)
+            _spreadsheets[sheet_id] = spreadsheet
+        return spreadsheet
+
+
+def get_worksheet(title, sheet_id=SHEET_ID):
+    """Cached Worksheet handle (raises WorksheetNotFound / API errors)."""
+    key = (sheet_id, title)
+    with _lock:
+        worksheet = _worksheets.get(key)
+        if worksheet is None:
+            worksheet = get_spreadsheet(sheet_id).worksheet(title)
+            _worksheets[key] = worksheet
+        return worksheet
+
+
+def reset_connection():
+    """Drop the client and cached handles (e.g. after a sheet was renamed)."""
+    global _client
+    with _lock:
+        _client = None
+        _spreadsheets.clear()
+        _worksheets.clear()
+
+
+def set_backend(client):
+    """
+    Use another client object instead of the authenticated gspread client,
+    e.g. fake_sheets.FakeClient for offline tests and benchmarks. It must
+    provide open_by_key() and the gspread Spreadsheet/Worksheet subset this
+    app uses. Cached sheet data is dropped; the local mirror is bypassed
+    while a stand-in is active. set_backend(None) goes back to gspread.
+    """
+    global _client, _backend_override
+    with _lock:
+        reset_connection()
+        _client = client
+        _backend_override = client is not None
+    with _cache_lock:
+        _sheet_cache.clear()
+
+
+def authenticate_google_sheets():
+    """
+    Authenticate with Google Sheets API
+    Uses st.secrets for credentials (Streamlit Cloud)
+    """
+    client = get_client()
+    if client is None:
+        st.error("Authentication failed: could not connect to Google Sheets")
+        st.info("Please add gcp_service_account to Streamlit Secrets")
+    return client
+
+
+# ====================================================
+# SNAPSHOT LOADER (all app worksheets in one request)
+# ====================================================
+# Worksheets a page render needs; fetched together by one values_batch_get
+SNAPSHOT_SHEETS = (
+    "Candidates", "Sheet4", "CID", "Interview_Records", "Sheet2", "Users"
+)
+
+
+def values_to_frame(values):
+    """
+    DataFrame from raw sheet values (header in row 1), typed exactly like
+    pd.DataFrame(worksheet.get_all_records()): rows padded to the widest
+    row, numeric-looking strings converted to int/float. Duplicate headers
+    keep the last value instead of raising like get_all_records.
+    """
+    values = fill_gaps(values)
+    if not values:
+        return pd.DataFrame()
+    keys = values[0]
+    records = [
+        dict(zip(keys, numericise_all(row, False, "", False, [])))
+        for row in values[1:]
+    ]
+    return pd.DataFrame(records)
+
+
+def fetch_sheet_values(titles, sheet_id=SHEET_ID):
+    """
+    Raw values of several worksheets in ONE values_batch_get call.
+    If the batch fails (e.g. a tab was renamed) each tab is read on its own
+    and missing tabs are skipped. Returns {title: list of rows}.
+    """
+    titles = list(titles)
+    try:
+        response = get_spreadsheet(sheet_id).values_batch_get(
+            [absolute_range_name(t) for t in titles]
+        )
+        value_ranges = response.get("valueRanges", [])
+        return {
+            title: vr.get("values", [[]])
+            for title, vr in zip(titles, value_ranges)
+        }
+    except Exception as e:
+        logger.warning(f"Batch read failed, reading sheets one by one: {e}")
+
+    result = {}
+    for title in titles:
+        try:
+            result[title] = get_worksheet(title, sheet_id).get_all_values()
+        except Exception as e:
+            logger.warning(f"Skipping sheet '{title}': {e}")
+    return result
+
+
+# ====================================================
+# WORKSHEET CACHE (one entry per tab, patched on write)
+# ====================================================
+# Raw values are cached per (sheet id, tab) for SHEET_CACHE_TTL seconds, so
+# a write only touches the tab it changed. The write helpers below call the
+# API and then patch the cached values with what was written – no refetch.
+# Every change bumps the tab's version; sheet_version() is a cheap cache key
+# for anything derived from a tab (e.g. st.cache_data in app.py).
+# sheet_load_version() only changes when values come in from outside
+# (API / mirror load, delta sync) – not when the app's own writes patch them.
+#
+# With the local mirror enabled (sheets_mirror.MIRROR_PATH) a cache miss is
+# served from SQLite instead of the API, and a background thread keeps the
+# mirror and these entries in sync every MIRROR_SYNC_INTERVAL seconds.
+SHEET_CACHE_TTL = 300
+MIRROR_SYNC_INTERVAL = int(os.environ.get("SHEETS_MIRROR_SYNC_SECONDS", 60))
+
+_cache_lock = threading.RLock()
+_sheet_cache = {}
+_versions = itertools.count(1)
+_sync_threads = {}
+_held = Counter()
+
+
+def _is_fresh(entry):
+    return (
+        entry is not None
+        and time.monotonic() - entry["loaded"] < SHEET_CACHE_TTL
+    )
+
+
+def _new_entry(key, values):
+    version = next(_versions)
+    entry = {
+        "values": values,
+        "frame": None,
+        "loaded": time.monotonic(),
+        "written": 0.0,
+        "version": version,
+        "load_version": version,
+        "indexes": {},
+    }
+    _sheet_cache[key] = entry
+    return entry
+
+
+def _mirror_enabled():
+    return bool(sheets_mirror.MIRROR_PATH) and not _backend_override
+
+
+def _mirror_call(func, *args):
+    """Run a sheets_mirror function; a broken mirror must never break reads."""
+    if not _mirror_enabled():
+        return None
+    try:
+        return func(*args)
+    except Exception as e:
+        logger.warning(f"Sheets mirror error ({func.__name__}): {e}")
+        return None
+
+
+def _usable(entry, key):
+    """Cached entry that can be served without a reload."""
+    return _is_fresh(entry) or (
+        entry is not None and entry["values"] is not None and _held[key]
+    )
+
+
+def _load_entry(title, sheet_id):
+    """
+    Cache entry of one tab: memory → local mirror → Sheets API.
+    A stale SNAPSHOT_SHEETS tab (except Users) refreshes every stale
+    snapshot tab in the same values_batch_get call. Tabs that could not be
+    read are remembered (values None) until the TTL runs out.
+    The API read runs without _cache_lock (other tabs stay readable);
+    sessions missing the same tabs at once share one request.
+    """
+    key = (sheet_id, title)
+    with _cache_lock:
+        entry = _sheet_cache.get(key)
+        if _usable(entry, key):
+            return entry
+
+    values = _mirror_call(sheets_mirror.read_sheet, title, sheet_id)
+    if values is not None:
+        start_mirror_sync(sheet_id)
+        with _cache_lock:
+            entry = _sheet_cache.get(key)
+            if _usable(entry, key):
+                return entry
+            if entry is not None and entry["values"] == values:
+                entry["loaded"] = time.monotonic()
+                return entry
+            return _new_entry(key, values)
+
+    with _cache_lock:
+        titles = [title]
+        # Users is never mirrored - a login reads it alone instead of
+        # pulling every stale snapshot tab along with it
+        if title in SNAPSHOT_SHEETS and title not in sheets_mirror.UNMIRRORED_SHEETS:
+            titles = [
+                t for t in SNAPSHOT_SHEETS
+                if not _is_fresh(_sheet_cache.get((sheet_id, t)))
+            ]
+    started = time.monotonic()
+    fetched = single_flight(
+        ("sheet_values", sheet_id, tuple(titles)),
+        lambda: fetch_sheet_values(titles, sheet_id)
+    )
+
+    with _cache_lock:
+        for t in titles:
+            current = _sheet_cache.get((sheet_id, t))
+            # Loaded (e.g. by the request we shared) or patched by a write
+            # while this read was in flight - the cached copy is newer
+            if current is not None and (
+                current["loaded"] >= started or current["written"] >= started
+                or _usable(current, (sheet_id, t))
+            ):
+                continue
+            _new_entry((sheet_id, t), fetched.get(t))
+            if t in fetched:
+                _mirror_call(sheets_mirror.sync_sheet, t, fetched[t], sheet_id)
+        entry = _sheet_cache[key]
+    if fetched:
+        start_mirror_sync(sheet_id)
+    return entry
+
+
+def get_sheet_frame(title, sheet_id=SHEET_ID):
+    """
+    DataFrame of one worksheet (copy – safe to modify), typed like
+    pd.DataFrame(get_all_records()). Raises KeyError if the tab could not
+    be read.
+    """
+    entry = _load_entry(title, sheet_id)
+    with _cache_lock:
+        if entry["values"] is None:
+            raise KeyError(title)
+        if entry["frame"] is None:
+            entry["frame"] = values_to_frame(entry["values"])
+        return entry["frame"].copy()
+
+
+def load_snapshot(sheet_id=SHEET_ID):
+    """{title: DataFrame} for SNAPSHOT_SHEETS; unreadable tabs are absent."""
+    frames = {}
+    for title in SNAPSHOT_SHEETS:
+        try:
+            frames[title] = get_sheet_frame(title, sheet_id)
+        except KeyError:
+            pass
+    return frames
+
+
+def sheet_version(title, sheet_id=SHEET_ID):
+    """Changes whenever the cached tab is reloaded or patched."""
+    return _load_entry(title, sheet_id)["version"]
+
+
+def sheet_load_version(title, sheet_id=SHEET_ID):
+    """Changes only when the tab is (re)loaded – not on the app's own writes."""
+    return _load_entry(title, sheet_id)["load_version"]
+
+
+def invalidate_sheet(title=None, sheet_id=SHEET_ID):
+    """
+    Forget one cached tab (or every tab of the spreadsheet if title is None)
+    in memory and in the mirror – the next read goes to the API.
+    """
+    with _cache_lock:
+        for key in list(_sheet_cache):
+            if key[0] == sheet_id and title in (None, key[1]):
+                del _sheet_cache[key]
+        _mirror_call(sheets_mirror.drop_sheet, title, sheet_id)
+
+
+# ====================================================
+# MIRROR SYNC (background delta sync)
+# ====================================================
+def sync_mirror(sheet_id=SHEET_ID, titles=None):
+    """
+    Read tabs from the API once (one batch call) and apply the delta to the
+    mirror and the memory cache. Tabs written by the app while the read was
+    in flight are skipped until the next round. Returns the changed titles.
+    """
+    with _cache_lock:
+        if titles is None:
+            titles = list(SNAPSHOT_SHEETS) + sorted(
+                t for s, t in _sheet_cache
+                if s == sheet_id and t not in SNAPSHOT_SHEETS
+            )
+    started = time.monotonic()
+    fetched = fetch_sheet_values(titles, sheet_id)
+
+    changed = []
+    with _cache_lock:
+        for title, values in fetched.items():
+            entry = _sheet_cache.get((sheet_id, title))
+            if _held[(sheet_id, title)] or (
+                entry is not None and entry["written"] >= started
+            ):
+                continue
+            _mirror_call(sheets_mirror.sync_sheet, title, values, sheet_id)
+            if entry is None:
+                continue
+            if entry["values"] != values:
+                entry["values"] = values
+                entry["frame"] = None
+                entry["indexes"] = {}
+                entry["version"] = next(_versions)
+                entry["load_version"] = entry["version"]
+                changed.append(title)
+            entry["loaded"] = time.monotonic()
+    return changed
+
+
+def refresh_sheets(sheet_id=SHEET_ID):
+    """'Refresh Data': delta sync through the mirror, else drop the cache."""
+    if _mirror_enabled():
+        sync_mirror(sheet_id)
+    else:
+        invalidate_sheet(None, sheet_id)
+
+
+def _sync_loop(sheet_id):
+    while True:
+        try:
+            sync_mirror(sheet_id)
+        except Exception as e:
+            logger.warning(f"Mirror sync failed: {e}")
+        time.sleep(MIRROR_SYNC_INTERVAL)
+
+
+def start_mirror_sync(sheet_id=SHEET_ID):
+    """Start the background sync thread for a spreadsheet (once per process)."""
+    if not _mirror_enabled():
+        return
+    with _cache_lock:
+        if sheet_id in _sync_threads:
+            return
+        thread = threading.Thread(
+            target=_sync_loop, args=(sheet_id,),
+            name=f"sheets-mirror-sync-{sheet_id[:8]}", daemon=True
+        )
+        _sync_threads[sheet_id] = thread
+        thread.start()
+
+
+def _cell_text(value):
+    """Value as get_all_values() would return it after the write."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def _cached_entry(title, sheet_id):
+    """Loaded cache entry to patch after a write, or None."""
+    entry = _sheet_cache.get((sheet_id, title))
+    if entry is None:
+        # Mirror copy must see the write too, not only the memory cache
+        values = _mirror_call(sheets_mirror.read_sheet, title, sheet_id)
+        if values is not None:
+            entry = _new_entry((sheet_id, title), values)
+    if entry is None or entry["values"] is None:
+        return None
+    entry["version"] = next(_versions)
+    entry["written"] = time.monotonic()
+    return entry
+
+
+def _set_cells(values, row, col, block):
+    """Write a 2-D block into cached values starting at (row, col), 1-based."""
+    for r, row_values in enumerate(block, start=row - 1):
+        while len(values) <= r:
+            values.append([])
+        line = values[r]
+        end = col - 1 + len(row_values)
+        if len(line) < end:
+            line.extend([""] * (end - len(line)))
+        line[col - 1:end] = [_cell_text(v) for v in row_values]
+
+
+def _mirror_rows(title, sheet_id, values, row_nums, old_len):
+    """Write the touched rows (and any rows added after old_len) to the mirror."""
+    rows = set(row_nums) | set(range(old_len + 1, len(values) + 1))
+    _mirror_call(
+        sheets_mirror.write_rows, title,
+        {n: values[n - 1] for n in rows}, len(values), sheet_id
+    )
+
+
+# ====================================================
+# WRITE HELPERS (API write + cache patch)
+# ====================================================
+def append_rows(title, rows, sheet_id=SHEET_ID, **kwargs):
+    """worksheet.append_rows() that also appends the rows to the cache."""
+    response = get_worksheet(title, sheet_id).append_rows(rows, **kwargs)
+    cache_appended_rows(title, rows, sheet_id)
+    return response
+
+
+def cache_appended_rows(title, rows, sheet_id=SHEET_ID):
+    """Append rows to the cached tab (after, or ahead of, the API append)."""
+    with _cache_lock:
+        entry = _cached_entry(title, sheet_id)
+        if entry is not None:
+            values = entry["values"]
+            old_len = len(values)
+            new_rows = [[_cell_text(v) for v in row] for row in rows]
+            width = max((len(line) for line in values), default=0)
+            frame = entry["frame"]
+            if (
+                frame is not None and not frame.empty and values
+                and all(len(line) <= width for line in new_rows)
+            ):
+                # Same padding/typing as a full rebuild, only for new rows
+                header = values[0] + [""] * (width - len(values[0]))
+                added = values_to_frame([header] + new_rows)
+                entry["frame"] = pd.concat([frame, added], ignore_index=True)
+            else:
+                entry["frame"] = None
+            values.extend(new_rows)
+            _index_appended(entry, old_len)
+            _mirror_rows(title, sheet_id, values, [], old_len)
+
+
+def append_row(title, row, sheet_id=SHEET_ID, **kwargs):
+    """worksheet.append_row() that also appends the row to the cache."""
+    return append_rows(title, [row], sheet_id, **kwargs)
+
+
+def update_cell(title, row, col, value, sheet_id=SHEET_ID):
+    """worksheet.update_cell() that also patches the cached cell."""
+    response = get_worksheet(title, sheet_id).update_cell(row, col, value)
+    with _cache_lock:
+        entry = _cached_entry(title, sheet_id)
+        if entry is not None:
+            old_len = len(entry["values"])
+            _set_cells(entry["values"], row, col, [[value]])
+            entry["frame"] = None
+            _drop_indexes(entry, row, col, 1)
+            _mirror_rows(title, sheet_id, entry["values"], [row], old_len)
+    return response
+
+
+def batch_update(title, data, sheet_id=SHEET_ID, **kwargs):
+    """
+    worksheet.batch_update() that also patches the cached cells.
+    data: [{'range': 'B5' / 'B5:D5', 'values': [[...]]}, ...]
+    """
+    response = get_worksheet(title, sheet_id).batch_update(data, **kwargs)
+    cache_written_ranges(title, data, sheet_id)
+    return response
+
+
+def cache_written_ranges(title, data, sheet_id=SHEET_ID):
+    """Apply {'range', 'values'} blocks to the cached tab."""
+    with _cache_lock:
+        entry = _cached_entry(title, sheet_id)
+        if entry is not None:
+            old_len = len(entry["values"])
+            touched = []
+            for item in data:
+                start = item["range"].split("!")[-1].split(":")[0]
+                row, col = a1_to_rowcol(start)
+                _set_cells(entry["values"], row, col, item["values"])
+                touched.extend(range(row, row + len(item["values"])))
+                width = max((len(r) for r in item["values"]), default=0)
+                _drop_indexes(entry, row, col, width)
+            entry["frame"] = None
+            _mirror_rows(title, sheet_id, entry["values"], touched, old_len)
+
+
+# ====================================================
+# WRITE BATCH (unit of work across tabs)
+# ====================================================
+# A write batch is a plain dict {title: [{'range': 'B5', 'values': [[...]]}]}
+# (same items as batch_update). Collect every cell of a status change –
+# Interview_Records, Candidates, Sheet4 – then flush_writes() sends them
+# in one spreadsheet.values_batch_update. The API applies that request as
+# a whole, so a failure leaves no tab half-updated.
+# Ranges are built with rowcol_to_a1 (any column, AA, BC, ...) and cells
+# next to each other in one row are merged into one 'I5:L5' range.
+
+def queue_cell(batch, title, row, col, value):
+    """
+    Add one cell change to a write batch – appended to the previous range
+    when that range ends just left of it in the same row.
+    """
+    items = batch.setdefault(title, [])
+    if items:
+        last = items[-1]
+        first_cell, _, last_cell = last["range"].partition(":")
+        if (len(last["values"]) == 1
+                and a1_to_rowcol(first_cell)[0] == row
+                and a1_to_rowcol(last_cell or first_cell) == (row, col - 1)):
+            last["range"] = f"{first_cell}:{rowcol_to_a1(row, col)}"
+            last["values"][0].append(value)
+            return
+    items.append({
+        "range": rowcol_to_a1(row, col),
+        "values": [[value]],
+    })
+
+
+def queue_cells(batch, title, row, cells):
+    """
+    Add {col: value} changes of one row to a write batch; adjacent columns
+    become one contiguous range.
+    """
+    for col in sorted(cells):
+        queue_cell(batch, title, row, col, cells[col])
+
+
+def flush_writes(batch, sheet_id=SHEET_ID, value_input_option="RAW"):
+    """
+    Write every queued change in one API call, then patch the cache of
+    each tab. The batch is emptied on success and kept on failure.
+    """
+    response = send_writes(batch, sheet_id, value_input_option)
+    for title, items in batch.items():
+        cache_written_ranges(title, items, sheet_id)
+    batch.clear()
+    return response
+
+
+def send_writes(batch, sheet_id=SHEET_ID, value_input_option="RAW"):
+    """The values_batch_update call of flush_writes() alone (cache untouched)."""
+    data = [
+        {"range": absolute_range_name(title, item["range"]), "values": item["values"]}
+        for title, items in batch.items()
+        for item in items
+    ]
+    if not data:
+        return None
+    return get_spreadsheet(sheet_id).values_batch_update(body={
+        "valueInputOption": value_input_option,
+        "data": data,
+    })
+
+
+def hold_tabs(titles, sheet_id=SHEET_ID):
+    """
+    Keep the cached copy of tabs with queued writes (see write_queue):
+    no TTL reload and no mirror sync may replace the already-patched values
+    with older data from the API until release_tabs().
+    """
+    with _cache_lock:
+        for title in titles:
+            _held[(sheet_id, title)] += 1
+
+
+def release_tabs(titles, sheet_id=SHEET_ID):
+    with _cache_lock:
+        for title in titles:
+            key = (sheet_id, title)
+            _held[key] -= 1
+            if _held[key] <= 0:
+                del _held[key]
+            entry = _sheet_cache.get(key)
+            if entry is not None:
+                # A sync that started before the write landed is stale
+                entry["written"] = time.monotonic()
+
+
+# ====================================================
+# ROW INDEX (key → sheet row numbers)
+# ====================================================
+# Lookups like "row of Candidate ID X" or "row of (CID, Job Title)" used to
+# download the whole tab and scan it. An index per (tab, key columns) is
+# built once from the cached values, extended by append_rows() and dropped
+# when a write touches its key columns (rebuilt on next use). Key values
+# are compared as stripped strings, column names case-insensitively.
+#
+# The cache can lag behind the live sheet (rows inserted/sorted in Google
+# Sheets by hand), so locate_row() re-reads the one target row to verify
+# it and only rescans the key columns when the index turns out stale.
+
+def _norm_key(key):
+    if not isinstance(key, (tuple, list)):
+        key = (key,)
+    return tuple(str(v).strip() for v in key)
+
+
+def _key_cols(header, key_columns):
+    """0-based positions of key_columns in header, None if any is missing."""
+    names = [str(h).strip().lower() for h in header]
+    cols = []
+    for column in key_columns:
+        column = str(column).strip().lower()
+        if column not in names:
+            return None
+        cols.append(names.index(column))
+    return cols
+
+
+def _row_key(line, cols):
+    return tuple(line[c].strip() if c < len(line) else "" for c in cols)
+
+
+def _add_rows(index, values, start):
+    """Index values[start:] (sheet row number = list position + 1)."""
+    rows, cols = index["rows"], index["cols"]
+    for row_num in range(start + 1, len(values) + 1):
+        rows.setdefault(_row_key(values[row_num - 1], cols), []).append(row_num)
+
+
+def _entry_index(entry, key_columns):
+    """Index of a loaded cache entry, built on first use (None if no such columns)."""
+    name = tuple(str(c).strip().lower() for c in key_columns)
+    index = entry["indexes"].get(name)
+    if index is None:
+        values = entry["values"]
+        cols = _key_cols(values[0], key_columns) if values else None
+        if cols is None:
+            return None
+        index = {"cols": cols, "rows": {}}
+        _add_rows(index, values, 1)
+        entry["indexes"][name] = index
+    return index
+
+
+def _index_appended(entry, old_len):
+    """Keep every index of the entry current after rows were appended."""
+    for index in entry["indexes"].values():
+        _add_rows(index, entry["values"], max(old_len, 1))
+
+
+def _drop_indexes(entry, row, col, width):
+    """Forget indexes whose key cells (or the header) a write touched."""
+    for name, index in list(entry["indexes"].items()):
+        if row == 1 or any(col - 1 <= c < col - 1 + width for c in index["cols"]):
+            del entry["indexes"][name]
+
+
+def sheet_header(title, sheet_id=SHEET_ID):
+    """Header row of a cached tab ([] if the tab could not be read)."""
+    values = _load_entry(title, sheet_id)["values"]
+    with _cache_lock:
+        return list(values[0]) if values else []
+
+
+def find_rows(title, key_columns, key, sheet_id=SHEET_ID):
+    """
+    Sheet row numbers (1-based) whose key_columns equal key, from the
+    cached index – no API call. [] if not found or the columns are missing.
+    """
+    entry = _load_entry(title, sheet_id)
+    with _cache_lock:
+        if not entry["values"]:
+            return []
+        index = _entry_index(entry, key_columns)
+        if index is None:
+            return []
+        return list(index["rows"].get(_norm_key(key), []))
+
+
+def find_records(title, key_columns, key, sheet_id=SHEET_ID):
+    """
+    [(row number, row values)] of the rows whose key_columns equal key –
+    index lookup plus the cached rows (kept current by the write helpers),
+    no API call. Rows are padded to the header width.
+    """
+    entry = _load_entry(title, sheet_id)
+    with _cache_lock:
+        values = entry["values"]
+        if not values:
+            return []
+        index = _entry_index(entry, key_columns)
+        if index is None:
+            return []
+        width = len(values[0])
+        return [
+            (row_num, list(values[row_num - 1]) + [""] * (width - len(values[row_num - 1])))
+            for row_num in index["rows"].get(_norm_key(key), [])
+            if row_num <= len(values)
+        ]
+
+
+def row_keys(title, key_columns, sheet_id=SHEET_ID):
+    """
+    Set of key tuples (stripped strings) present in the cached tab, from
+    the same index as find_rows() – no API call. None if the columns are
+    missing or the tab could not be read.
+    """
+    entry = _load_entry(title, sheet_id)
+    with _cache_lock:
+        if not entry["values"]:
+            return None
+        index = _entry_index(entry, key_columns)
+        if index is None:
+            return None
+        return set(index["rows"])
+
+
+def rescan_rows(title, key_columns, key, sheet_id=SHEET_ID):
+    """
+    Re-read only the header and the key columns from the API and return the
+    rows matching key. If the live keys differ from the cache, the cached
+    tab is stale and gets invalidated (reloaded on next read).
+    """
+    worksheet = get_worksheet(title, sheet_id)
+    header = worksheet.row_values(1)
+    cols = _key_cols(header, key_columns)
+    if cols is None:
+        return []
+
+    letters = [rowcol_to_a1(1, c + 1)[:-1] for c in cols]
+    response = worksheet.spreadsheet.values_batch_get(
+        [absolute_range_name(title, f"{letter}:{letter}") for letter in letters]
+    )
+    columns = [
+        [row[0] if row else "" for row in vr.get("values", [])]
+        for vr in response.get("valueRanges", [])
+    ]
+    height = max((len(column) for column in columns), default=0)
+    blank = ("",) * len(cols)
+    live = {}
+    for row_num in range(2, height + 1):
+        row_key = tuple(
+            column[row_num - 1].strip() if row_num <= len(column) else ""
+            for column in columns
+        )
+        if row_key != blank:
+            live.setdefault(row_key, []).append(row_num)
+
+    with _cache_lock:
+        entry = _sheet_cache.get((sheet_id, title))
+        if entry is not None and entry["values"]:
+            index = _entry_index(entry, key_columns)
+            cached = {} if index is None else {
+                k: v for k, v in index["rows"].items() if k != blank
+            }
+            if cached != live:
+                logger.info(f"Row index of '{title}' is stale – reloading the tab")
+                invalidate_sheet(title, sheet_id)
+    return live.get(_norm_key(key), [])
+
+
+def locate_row(title, key_columns, key, sheet_id=SHEET_ID):
+    """
+    (row number, live row values padded to the header) of the first row
+    whose key_columns equal key, or (None, None).
+    Index hit → one row read to verify; miss/mismatch → rescan_rows().
+    """
+    key = _norm_key(key)
+    worksheet = get_worksheet(title, sheet_id)
+
+    def verified(rows):
+        if not rows:
+            return None, None
+        header = sheet_header(title, sheet_id)
+        cols = _key_cols(header, key_columns)
+        for row_num in rows:
+            line = worksheet.row_values(row_num)
+            line = line + [""] * (len(header) - len(line))
+            if cols is not None and _row_key(line, cols) == key:
+                return row_num, line
+        return None, None
+
+    row_num, line = verified(find_rows(title, key_columns, key, sheet_id))
+    if row_num is None:
+        row_num, line = verified(rescan_rows(title, key_columns, key, sheet_id))
+    return row_num, line
+
+
+@st.cache_data(ttl=300)
+def fetch_candidates_data(sheet_url, sheet_name="Candidates"):
+    """
+    Fetch all candidates data from Google Sheet
+    TTL = 5 minutes (cache refresh)
+    """
+    try:
+        client = authenticate_google_sheets()
+        if client is None:
+            return None
+        
+        worksheet = get_worksheet(sheet_name, extract_id_from_url(sheet_url))
+        
+        # Get all data
+        data = worksheet.get_all_values()
+        
+        if len(data) <= 1:
+            return None
+        
+        # Convert to DataFrame
+        headers = data[0]
+        rows = data[1:]
+        df = pd.DataFrame(rows, columns=headers)
+        
+        return df
+    except Exception as e:
+        st.error(f"Error fetching data: {str(e)}")
+        return None
+
+
+@st.cache_data(ttl=300)
+def fetch_companies_data(sheet_url, sheet_name="Sheet4"):
+    """
+    Fetch all companies data from Google Sheet (Sheet4)
+    TTL = 5 minutes (cache refresh)
+    """
+    try:
+        client = authenticate_google_sheets()
+        if client is None:
+            return None
+        
+        worksheet = get_worksheet(sheet_name, extract_id_from_url(sheet_url))
+        
+        # Get all data
+        data = worksheet.get_all_values()
+        
+        if len(data) <= 1:
+            return None
+        
+        # Convert to DataFrame
+        headers = data[0]
+        rows = data[1:]
+        df = pd.DataFrame(rows, columns=headers)
+        
+        return df
+    except Exception as e:
+        st.error(f"Error fetching companies data: {str(e)}")
+        return None
+
+
+def get_column_headers(df):
+    """Get all column headers from DataFrame"""
+    if df is None:
+        return []
+    return list(df.columns)
+
+
+def get_unique_values(df, column):
+    """
+    Get unique values from specific column
+    Remove empty values
+    """
+    if df is None or column not in df.columns:
+        return []
+    
+    values = df[column].unique().tolist()
+    values = [v for v in values if v and str(v).strip()]  # Remove empty
+    return sorted(values)
+
+
+def apply_filter(df, column, value):
+    """
+    Apply single filter to DataFrame
+    Returns filtered DataFrame
+    """
+    if df is None or column not in df.columns:
+        return df
+    
+    filtered = df[df[column] == value]
+    return filtered
@@ -0,0 +1,174 @@
+"""
+Sheets Limiter Module
+Process-wide guard in front of every Google Sheets API request
+- token buckets sized to the Sheets per-minute quotas (reads / writes)
+- single-flight: identical reads in flight at the same moment share one
+  request and its response
+- counters (requests, throttled, coalesced, quota errors) for the UI/logs
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from gspread.client import Client
+from gspread.exceptions import APIError
+
+logger = logging.getLogger(__name__)
+
+# Google Sheets API: 60 read and 60 write requests per minute per user
+# (the service account is one user for every staff session)
+READS_PER_MINUTE = int(os.environ.get("SHEETS_READS_PER_MINUTE", 60))
+WRITES_PER_MINUTE = int(os.environ.get("SHEETS_WRITES_PER_MINUTE", 60))
+BURST = int(os.environ.get("SHEETS_BURST", 10))
+
+_bucket_lock = threading.Lock()
+_flight_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = Counter()
+_inflight = {}
+
+
+def _new_bucket(per_minute):
+    # Refill so that a full burst plus one minute of refill stays within
+    # the quota: capacity + 60 * rate <= per_minute
+    capacity = max(1, min(BURST, per_minute - 1))
+    return {
+        "capacity": capacity,
+        "rate": max(per_minute - capacity, 1) / 60.0,
+        "tokens": float(capacity),
+        "stamp": time.monotonic(),
+    }
+
+
+_buckets = {
+    "read": _new_bucket(READS_PER_MINUTE),
+    "write": _new_bucket(WRITES_PER_MINUTE),
+}
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+# ====================================================
+# TOKEN BUCKET
+# ====================================================
+def acquire(kind):
+    """
+    Take one token from the 'read' or 'write' bucket, sleeping while it is
+    empty. Returns the seconds waited.
+    """
+    waited = 0.0
+    while True:
+        with _bucket_lock:
+            bucket = _buckets[kind]
+            now = time.monotonic()
+            bucket["tokens"] = min(
+                bucket["capacity"],
+                bucket["tokens"] + (now - bucket["stamp"]) * bucket["rate"]
+            )
+            bucket["stamp"] = now
+            if bucket["tokens"] >= 1:
+                bucket["tokens"] -= 1
+                break
+            delay = (1 - bucket["tokens"]) / bucket["rate"]
+        if not waited:
+            _count("throttled")
+        time.sleep(delay)
+        waited += delay
+    if waited:
+        _count("throttle_wait_ms", int(waited * 1000))
+    return waited
+
+
+def drain(kind):
+    """Empty a bucket after a 429 – the quota is already used up."""
+    with _bucket_lock:
+        _buckets[kind]["tokens"] = min(_buckets[kind]["tokens"], 0.0)
+
+
+# ====================================================
+# SINGLE-FLIGHT
+# ====================================================
+def single_flight(key, func):
+    """
+    func() once per key at a time: callers arriving while the first call
+    is running wait for it and get the same result (or exception).
+    """
+    with _flight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = {"event": threading.Event(), "result": None, "error": None}
+            _inflight[key] = flight
+
+    if not leader:
+        _count("coalesced")
+        flight["event"].wait()
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["result"]
+
+    try:
+        flight["result"] = func()
+        return flight["result"]
+    except Exception as e:
+        flight["error"] = e
+        raise
+    finally:
+        with _flight_lock:
+            del _inflight[key]
+        flight["event"].set()
+
+
+# ====================================================
+# GSPREAD CLIENT
+# ====================================================
+class LimitedClient(Client):
+    """gspread.Client whose every API request goes through the limiter."""
+
+    def request(self, method, endpoint, params=None, data=None, json=None,
+                files=None, headers=None):
+        kind = "read" if method.lower() == "get" else "write"
+
+        def call():
+            acquire(kind)
+            _count(f"{kind}s")
+            try:
+                return Client.request(
+                    self, method, endpoint, params=params, data=data,
+                    json=json, files=files, headers=headers
+                )
+            except APIError as e:
+                if getattr(e.response, "status_code", None) == 429:
+                    _count("quota_errors")
+                    drain(kind)
+                    logger.warning(f"Sheets API quota exceeded ({kind})")
+                raise
+
+        if kind == "read" and data is None and json is None and files is None:
+            return single_flight((endpoint, _params_key(params)), call)
+        return call()
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True, default=str) if params else ""
+
+
+def get_api_stats():
+    """
+    Counters since start: reads, writes, throttled (calls that had to
+    wait), throttle_wait_ms, coalesced (reads served by another caller's
+    request), quota_errors (429 responses).
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    for name in ("reads", "writes", "throttled", "throttle_wait_ms",
+                 "coalesced", "quota_errors"):
+        stats.setdefault(name, 0)
+    return stats
@@ -0,0 +1,210 @@
+"""
+Sheets Mirror Module
+Local SQLite copy of the Google Sheets tabs the app reads
+One row per sheet row + its hash, so a sync only rewrites rows that changed
+
+The file holds plain copies of the mirrored tabs (candidate contact
+details, Aadhaar/PAN, ...) – keep .cache/ private and out of backups you
+share. Tabs in UNMIRRORED_SHEETS (Users: password hashes) are never
+written to it; reads of those always go to the Sheets API.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# "" → mirror disabled (reads go straight to the Sheets API)
+MIRROR_PATH = os.environ.get(
+    "SHEETS_MIRROR_PATH", os.path.join(".cache", "sheets_mirror.sqlite3")
+)
+
+# Never copied to disk (password hashes / permissions)
+UNMIRRORED_SHEETS = frozenset({"Users"})
+
+_lock = threading.RLock()
+_connections = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    sheet_id TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    row_num  INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (sheet_id, title, row_num)
+);
+CREATE TABLE IF NOT EXISTS sheet_meta (
+    sheet_id  TEXT NOT NULL,
+    title     TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    synced_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (sheet_id, title)
+);
+"""
+
+
+# ====================================================
+# CONNECTION
+# ====================================================
+def get_connection(path=MIRROR_PATH):
+    """Shared SQLite connection per mirror file (created on first use)."""
+    with _lock:
+        conn = _connections.get(path)
+        if conn is None:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            # Copies written by older versions before the exclusion
+            with conn:
+                for title in UNMIRRORED_SHEETS:
+                    conn.execute("DELETE FROM sheet_rows WHERE title=?", (title,))
+                    conn.execute("DELETE FROM sheet_meta WHERE title=?", (title,))
+            _connections[path] = conn
+        return conn
+
+
+def close_connections():
+    """Close every open mirror connection."""
+    with _lock:
+        for conn in _connections.values():
+            conn.close()
+        _connections.clear()
+
+
+# ====================================================
+# READ / WRITE
+# ====================================================
+def _row_json(row):
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+
+
+def _row_hash(row_json):
+    return hashlib.sha1(row_json.encode("utf-8")).hexdigest()
+
+
+def read_sheet(title, sheet_id, path=MIRROR_PATH):
+    """
+    Mirrored values of one tab (list of rows, like get_all_values()).
+    Returns None if the tab was never synced (or is not mirrored).
+    """
+    if title in UNMIRRORED_SHEETS:
+        return None
+    with _lock:
+        conn = get_connection(path)
+        meta = conn.execute(
+            "SELECT row_count FROM sheet_meta WHERE sheet_id=? AND title=?",
+            (sheet_id, title)
+        ).fetchone()
+        if meta is None:
+            return None
+        rows = conn.execute(
+            "SELECT row_num, row_json FROM sheet_rows "
+            "WHERE sheet_id=? AND title=? ORDER BY row_num",
+            (sheet_id, title)
+        ).fetchall()
+
+    values = [[] for _ in range(meta[0])]
+    for row_num, row_json in rows:
+        if row_num <= meta[0]:
+            values[row_num - 1] = json.loads(row_json)
+    return values
+
+
+def sync_sheet(title, values, sheet_id, path=MIRROR_PATH):
+    """
+    Bring the mirrored tab in line with freshly read values.
+    Delta by row count + per-row hash: only new/changed rows are written,
+    rows past the new end are deleted. Returns the number of rows touched.
+    """
+    if title in UNMIRRORED_SHEETS:
+        return 0
+    with _lock:
+        conn = get_connection(path)
+        stored = dict(conn.execute(
+            "SELECT row_num, row_hash FROM sheet_rows "
+            "WHERE sheet_id=? AND title=?",
+            (sheet_id, title)
+        ).fetchall())
+
+        changed = []
+        for row_num, row in enumerate(values, start=1):
+            row_json = _row_json(row)
+            row_hash = _row_hash(row_json)
+            if stored.get(row_num) != row_hash:
+                changed.append((sheet_id, title, row_num, row_hash, row_json))
+        removed = sum(1 for row_num in stored if row_num > len(values))
+
+        with conn:
+            if changed:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sheet_rows "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    changed
+                )
+            if removed:
+                conn.execute(
+                    "DELETE FROM sheet_rows "
+                    "WHERE sheet_id=? AND title=? AND row_num>?",
+                    (sheet_id, title, len(values))
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO sheet_meta (sheet_id, title, row_count) "
+                "VALUES (?, ?, ?)",
+                (sheet_id, title, len(values))
+            )
+
+    if changed or removed:
+        logger.info(
+            f"Mirror '{title}': {len(changed)} rows written, {removed} removed"
+        )
+    return len(changed) + removed
+
+
+def write_rows(title, rows, row_count, sheet_id, path=MIRROR_PATH):
+    """
+    Write-through for app writes: store the given rows ({row_num: row})
+    and the tab's new row count. Ignored if the tab was never synced.
+    """
+    if title in UNMIRRORED_SHEETS:
+        return
+    with _lock:
+        conn = get_connection(path)
+        with conn:
+            updated = conn.execute(
+                "UPDATE sheet_meta SET row_count=?, synced_at=CURRENT_TIMESTAMP "
+                "WHERE sheet_id=? AND title=?",
+                (row_count, sheet_id, title)
+            ).rowcount
+            if not updated:
+                return
+            data = []
+            for row_num, row in rows.items():
+                row_json = _row_json(row)
+                data.append(
+                    (sheet_id, title, row_num, _row_hash(row_json), row_json)
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO sheet_rows VALUES (?, ?, ?, ?, ?)",
+                data
+            )
+
+
+def drop_sheet(title, sheet_id, path=MIRROR_PATH):
+    """Forget a mirrored tab, or every tab if title is None."""
+    where, args = "sheet_id=?", (sheet_id,)
+    if title is not None:
+        where, args = "sheet_id=? AND title=?", (sheet_id, title)
+    with _lock:
+        conn = get_connection(path)
+        with conn:
+            conn.execute(f"DELETE FROM sheet_rows WHERE {where}", args)
+            conn.execute(f"DELETE FROM sheet_meta WHERE {where}", args)
@@ -0,0 +1,384 @@
+"""
+Write Queue Module
+Background writer for Google Sheets mutations
+Jobs are stored in a local SQLite queue (they survive a restart) and
+applied in order by one worker thread, with exponential backoff on
+quota (429) and server (5xx) errors. The sheet cache is patched when a
+job is submitted, so the UI shows the change without waiting for Google.
+
+A timeout, 5xx or crash can hide a write that did reach Google, so a
+retry must not apply it twice:
+- batch jobs write fixed values to fixed cells – safe to resend
+- status_sync jobs are resolved once (live Vacancy Filled + 1 etc.) and
+  the resulting cells stored in the job; retries resend those cells
+- append jobs that may have landed are checked against the live tab
+  first and skipped if their rows are already there
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+import requests
+from gspread.exceptions import APIError
+
+import sheets_connector
+from sheets_connector import SHEET_ID
+from status_updater import queue_status_sync
+
+logger = logging.getLogger(__name__)
+
+QUEUE_PATH = os.environ.get(
+    "WRITE_QUEUE_PATH", os.path.join(".cache", "write_queue.sqlite3")
+)
+
+# Retry policy: delay = BACKOFF_BASE * 2^(attempt-1), capped, with jitter
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_lock = threading.RLock()
+_wakeup = threading.Event()
+_conn = None
+_worker = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS write_jobs (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind       TEXT NOT NULL,
+    sheet_id   TEXT NOT NULL,
+    titles     TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    error      TEXT NOT NULL DEFAULT '',
+    next_try   REAL NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS write_jobs_status ON write_jobs (status, id);
+"""
+
+
+# ====================================================
+# QUEUE STORAGE
+# ====================================================
+def _connection():
+    global _conn
+    with _lock:
+        if _conn is None:
+            folder = os.path.dirname(QUEUE_PATH)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            _conn = sqlite3.connect(QUEUE_PATH, check_same_thread=False)
+            _conn.row_factory = sqlite3.Row
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.executescript(_SCHEMA)
+        return _conn
+
+
+def _job_dict(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job["titles"] = json.loads(job["titles"])
+    job["payload"] = json.loads(job["payload"])
+    return job
+
+
+def _set_status(job_id, status, **fields):
+    fields["status"] = status
+    columns = ", ".join(f"{name}=?" for name in fields)
+    with _lock:
+        conn = _connection()
+        with conn:
+            conn.execute(
+                f"UPDATE write_jobs SET {columns}, updated_at=CURRENT_TIMESTAMP "
+                "WHERE id=?",
+                (*fields.values(), job_id)
+            )
+
+
+def _next_job():
+    """Oldest unfinished job (strict FIFO – later writes may depend on it)."""
+    with _lock:
+        row = _connection().execute(
+            "SELECT * FROM write_jobs WHERE status IN (?, ?) ORDER BY id LIMIT 1",
+            (QUEUED, RUNNING)
+        ).fetchone()
+    return _job_dict(row)
+
+
+# ====================================================
+# SUBMIT (cache patched now, API write in the background)
+# ====================================================
+def _submit(kind, titles, payload, sheet_id):
+    # Worker first – at start it holds the tabs of jobs already queued
+    start_worker()
+    titles = sorted(set(titles))
+    sheets_connector.hold_tabs(titles, sheet_id)
+    try:
+        with _lock:
+            conn = _connection()
+            with conn:
+                job_id = conn.execute(
+                    "INSERT INTO write_jobs (kind, sheet_id, titles, payload, status) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (kind, sheet_id, json.dumps(titles),
+                     json.dumps(payload, default=str), QUEUED)
+                ).lastrowid
+    except Exception:
+        sheets_connector.release_tabs(titles, sheet_id)
+        raise
+    _wakeup.set()
+    logger.info(f"Queued write job {job_id} ({kind}: {', '.join(titles)})")
+    return job_id
+
+
+def submit_append(title, rows, sheet_id=SHEET_ID, value_input_option="RAW"):
+    """Queue worksheet.append_rows(); returns the job id."""
+    job_id = _submit("append", [title], {
+        "title": title,
+        "rows": rows,
+        "value_input_option": value_input_option,
+    }, sheet_id)
+    sheets_connector.cache_appended_rows(title, rows, sheet_id)
+    return job_id
+
+
+def submit_batch(batch, sheet_id=SHEET_ID, value_input_option="RAW"):
+    """Queue a write batch (see sheets_connector.flush_writes); returns the job id."""
+    job_id = _submit("batch", list(batch), {
+        "batch": batch,
+        "value_input_option": value_input_option,
+    }, sheet_id)
+    for title, items in batch.items():
+        sheets_connector.cache_written_ranges(title, items, sheet_id)
+    return job_id
+
+
+def submit_status_sync(candidate_id, company_id, job_title, interview_status,
+                       result_status, batch=None, sheet_id=SHEET_ID):
+    """
+    Queue sync_all_statuses() together with the caller's batch (e.g. the
+    Interview_Records row) – applied as one write by the worker.
+    """
+    batch = batch or {}
+    job_id = _submit("status_sync", list(batch) + ["Candidates", "Sheet4"], {
+        "batch": batch,
+        "args": [candidate_id, company_id, job_title, interview_status, result_status],
+    }, sheet_id)
+    for title, items in batch.items():
+        sheets_connector.cache_written_ranges(title, items, sheet_id)
+    return job_id
+
+
+# ====================================================
+# WORKER
+# ====================================================
+def _row_text(row):
+    """Row as get_all_values() returns it, trailing blanks dropped."""
+    cells = [sheets_connector._cell_text(v).strip() for v in row]
+    while cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+
+def _already_appended(payload, sheet_id):
+    """True if the rows of an append job are already one block in the live tab."""
+    rows = [_row_text(row) for row in payload["rows"]]
+    if not rows:
+        return True
+    worksheet = sheets_connector.get_worksheet(payload["title"], sheet_id)
+    live = [_row_text(row) for row in worksheet.get_all_values()[1:]]
+    n = len(rows)
+    # Newest rows first - a lost append is near the end of the tab
+    return any(
+        live[i] == rows[0] and live[i:i + n] == rows
+        for i in range(len(live) - n, -1, -1)
+    )
+
+
+def _run(job):
+    """Apply one job to Google Sheets (raises on failure)."""
+    payload = job["payload"]
+    sheet_id = job["sheet_id"]
+    if job["kind"] == "append":
+        # Left RUNNING by a crash, or an earlier attempt may have landed
+        maybe_sent = job["status"] == RUNNING or payload.get("maybe_sent")
+        if maybe_sent and _already_appended(payload, sheet_id):
+            logger.info(
+                f"Write job {job['id']}: rows already in {payload['title']}, "
+                "not appending again"
+            )
+            return
+        sheets_connector.get_worksheet(payload["title"], sheet_id).append_rows(
+            payload["rows"], value_input_option=payload["value_input_option"]
+        )
+    elif job["kind"] == "batch":
+        sheets_connector.send_writes(
+            payload["batch"], sheet_id, payload["value_input_option"]
+        )
+    elif job["kind"] == "status_sync":
+        batch = payload["batch"]
+        if not payload.get("resolved"):
+            # Resolve once - a retry must not read the already-incremented
+            # Vacancy Filled and add 1 again
+            queue_status_sync(*payload["args"], batch)
+            payload["resolved"] = True
+            _set_status(job["id"], RUNNING, payload=json.dumps(payload, default=str))
+        sheets_connector.flush_writes(batch, sheet_id)
+    else:
+        raise ValueError(f"Unknown write job kind: {job['kind']}")
+
+
+def _retryable(error):
+    if isinstance(error, APIError):
+        return getattr(error.response, "status_code", None) in RETRY_STATUS
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def _maybe_sent(error):
+    """False only for errors that prove Google did not apply the request."""
+    if isinstance(error, APIError):
+        return getattr(error.response, "status_code", None) != 429
+    return True
+
+
+def _backoff(attempts):
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def process_next():
+    """
+    Run the oldest due job once. Returns False if there is nothing to do
+    right now, else True (job done, failed or rescheduled).
+    """
+    job = _next_job()
+    if job is None or job["next_try"] > time.time():
+        return False
+
+    _set_status(job["id"], RUNNING)
+    try:
+        _run(job)
+    except Exception as e:
+        attempts = job["attempts"] + 1
+        if _retryable(e) and attempts < MAX_ATTEMPTS:
+            delay = _backoff(attempts)
+            logger.warning(
+                f"Write job {job['id']} failed (attempt {attempts}), "
+                f"retrying in {delay:.1f}s: {e}"
+            )
+            fields = {}
+            if job["kind"] == "append" and _maybe_sent(e):
+                job["payload"]["maybe_sent"] = True
+                fields["payload"] = json.dumps(job["payload"], default=str)
+            _set_status(job["id"], QUEUED, attempts=attempts, error=str(e),
+                        next_try=time.time() + delay, **fields)
+            return True
+        logger.error(f"Write job {job['id']} failed: {e}")
+        # Cached tabs still show the change that never reached the sheet
+        sheets_connector.release_tabs(job["titles"], job["sheet_id"])
+        for title in job["titles"]:
+            sheets_connector.invalidate_sheet(title, job["sheet_id"])
+        _set_status(job["id"], FAILED, attempts=attempts, error=str(e))
+        return True
+
+    sheets_connector.release_tabs(job["titles"], job["sheet_id"])
+    _set_status(job["id"], DONE, attempts=job["attempts"] + 1, error="")
+    return True
+
+
+def _worker_loop():
+    while True:
+        try:
+            if process_next():
+                continue
+            job = _next_job()
+            wait = 30.0 if job is None else max(0.0, job["next_try"] - time.time())
+        except Exception as e:
+            logger.error(f"Write queue error: {e}")
+            wait = 5.0
+        _wakeup.wait(wait)
+        _wakeup.clear()
+
+
+def start_worker():
+    """
+    Start the background writer (once per process). Jobs left over from a
+    previous run are resumed; their tabs stay held until they are applied.
+    """
+    global _worker
+    with _lock:
+        if _worker is not None:
+            return
+        conn = _connection()
+        leftover = [
+            _job_dict(row) for row in conn.execute(
+                "SELECT * FROM write_jobs WHERE status IN (?, ?) ORDER BY id",
+                (QUEUED, RUNNING)
+            )
+        ]
+        for job in leftover:
+            sheets_connector.hold_tabs(job["titles"], job["sheet_id"])
+        _worker = threading.Thread(
+            target=_worker_loop, name="sheets-write-queue", daemon=True
+        )
+        _worker.start()
+    if leftover:
+        logger.info(f"Resuming {len(leftover)} queued write job(s)")
+
+
+# ====================================================
+# STATUS (for the UI)
+# ====================================================
+def job_status(job_id):
+    """{'id', 'kind', 'status', 'attempts', 'error', ...} or None."""
+    with _lock:
+        row = _connection().execute(
+            "SELECT * FROM write_jobs WHERE id=?", (job_id,)
+        ).fetchone()
+    return _job_dict(row)
+
+
+def pending_count():
+    with _lock:
+        return _connection().execute(
+            "SELECT COUNT(*) FROM write_jobs WHERE status IN (?, ?)",
+            (QUEUED, RUNNING)
+        ).fetchone()[0]
+
+
+def last_pending_job(title, sheet_id=SHEET_ID):
+    """Id of the newest queued/running job that writes title, or None."""
+    with _lock:
+        rows = _connection().execute(
+            "SELECT id, titles FROM write_jobs WHERE status IN (?, ?) AND sheet_id=? "
+            "ORDER BY id DESC",
+            (QUEUED, RUNNING, sheet_id)
+        ).fetchall()
+    return next((row["id"] for row in rows if title in json.loads(row["titles"])), None)
+
+
+def wait_for(job_id, timeout=30.0):
+    """Block until a job is done/failed (or timeout); returns its status dict."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = job_status(job_id)
+        if job is None or job["status"] in (DONE, FAILED):
+            return job
+        if time.monotonic() >= deadline:
+            return job
+        time.sleep(0.05)